@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+###
+# Cost of auto-outline's "auto" color on large layers, against the fake GIMP
+# in benchmarks/fake_gimp.py: the sampled luminance histogram used by the
+# stroke engine (one reduced-scale buffer fetch) versus a histogram of every
+# pixel (a full-resolution fetch). Both should pick the same color.
+#
+# The fake's scaled fetch is plain nearest-neighbour indexing, so its
+# timings only show the NumPy side. GEGL's reduced-scale get() goes through
+# its mipmaps, which costs more, most of all at scales that are not powers
+# of two.
+#
+#   python3 benchmarks/auto_color.py --sizes 4K 8K --repeat 5
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+
+import fake_gimp
+
+fake_gimp.install()
+
+import numpy as np
+
+from owenjklan_core import outline, pixels
+
+SIZES = {
+    "1K": (1024, 576),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+}
+
+
+def synthetic_layer(width, height):
+    # A light subject with a dark band, on a transparent background
+    image = fake_gimp.Image(width, height)
+    layer = fake_gimp.Layer(image, "Subject", width, height)
+    image.insert_layer(layer, None, 0)
+
+    rng = np.random.default_rng(0)
+    subject = layer.pixels[height // 8:height * 7 // 8, width // 8:width * 7 // 8]
+    subject[..., :3] = rng.integers(150, 256, size=subject.shape[:2] + (3,), dtype=np.uint8)
+    subject[:subject.shape[0] // 4, :, :3] //= 4
+    subject[..., 3] = 255
+    return layer
+
+
+def sampled(layer):
+    return outline.contrasting_luma(outline.luma_histogram(pixels.sample_pixels(layer)))
+
+
+def full(layer):
+    return outline.contrasting_luma(outline.luma_histogram(
+        pixels.read_pixels(layer, 0, 0, layer.get_width(), layer.get_height())))
+
+
+def median_ms(function, layer, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(layer)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000.0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time auto-outline's contrasting color choice.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        layer = synthetic_layer(*SIZES[size])
+        sampled_ms, sampled_luma = median_ms(sampled, layer, args.repeat)
+        full_ms, full_luma = median_ms(full, layer, args.repeat)
+        print(f"{size:>3}: sampled {sampled_ms:8.2f} ms -> {sampled_luma:>3}"
+              f"   full {full_ms:8.2f} ms -> {full_luma:>3}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+###
+# Throughput and peak memory of headless batch runs with the "sync" export
+# (GIMP exports each file before the next one starts) and the "async"
+# export (writer threads encode while the next file is processed).
+#
+#   python3 benchmarks/batch_export.py --procedure owenjklan-quick-black-bottom \
+#       --extension .png --workers 1 ~/thumbnails/
+#
+# Each mode writes to its own temporary directory, which is removed again.
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+
+from owenjklan_core.batch_driver import collect_inputs, parse_arguments, run_pool
+from owenjklan_core.procedures import PROCEDURES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and async export in batch runs.")
+    parser.add_argument("inputs", nargs="+", help="Image files and/or directories of images")
+    parser.add_argument("--procedure", required=True, choices=sorted(PROCEDURES), metavar="NAME")
+    parser.add_argument("--set", dest="assignments", action="append", default=[], metavar="NAME=VALUE")
+    parser.add_argument("--extension", default=".png")
+    parser.add_argument("--gimp-console", default="gimp-console-3.0")
+    parser.add_argument("--workers", type=int, default=1, help="gimp-console processes")
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--queue-depth", type=int, default=4)
+    args = parser.parse_args()
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("No input images found.")
+        return 1
+
+    for mode in ("sync", "async"):
+        output_dir = tempfile.mkdtemp(prefix=f"owenjklan-export-{mode}-")
+        job = {
+            "procedure": args.procedure,
+            "arguments": parse_arguments(args.procedure, args.assignments),
+            "inputs": inputs,
+            "output_dir": output_dir,
+            "output_extension": args.extension,
+            "export": {"mode": mode, "writers": args.writers, "queue_depth": args.queue_depth},
+        }
+        try:
+            summary = run_pool(job, args.workers, retries=0, gimp_console=args.gimp_console)["summary"]
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+        print(f"{mode:>5}: {summary['succeeded']}/{summary['files']} files in {summary['wall_seconds']}s,"
+              f" {summary['files_per_second']} files/s, peak RSS {summary['peak_rss_mb']} MB")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1121 @@
+###
+# Stand-in for gi.repository.Gimp (and the bits of GLib, GObject, Gegl and
+# Gio the plug-ins use), so owenjklan_core code can be timed and profiled
+# without a running GIMP.
+#
+#   import fake_gimp
+#   fake_gimp.install()            # before importing owenjklan_core modules
+#   from owenjklan_core import guide_groups
+#
+# Images, layers, guides and the selection are plain Python objects, layer
+# pixels and selection masks are NumPy arrays. Every call that is a PDB
+# round trip in real GIMP (image, item, context and PDB functions) is
+# counted, and call_budget() raises CallBudgetExceeded as soon as a block
+# makes more of them than allowed, so a runaway loop stops with a count
+# instead of hanging.
+#
+# Only what owenjklan_core uses is implemented. Anything else is an
+# AttributeError, which is the cue to add it here.
+
+import bisect
+import collections
+import contextlib
+import functools
+import os
+import sys
+import tempfile
+import types
+
+import numpy as np
+
+### Call counting
+
+_calls = collections.Counter()
+_budget = None
+
+
+class CallBudgetExceeded(Exception):
+    def __init__(self, limit, calls):
+        super().__init__(f"more than {limit} PDB calls: {dict(calls.most_common(5))}")
+        self.limit = limit
+        self.calls = calls
+
+
+def _record(name):
+    global _budget
+    _calls[name] += 1
+    if _budget is not None:
+        limit, start = _budget
+        if sum(_calls.values()) - start > limit:
+            _budget = None
+            raise CallBudgetExceeded(limit, _calls.copy())
+
+
+def round_trip(function):
+    # Marks a function as one PDB round trip
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        _record(name)
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def calls():
+    return _calls.copy()
+
+
+def total_calls():
+    return sum(_calls.values())
+
+
+def reset_calls():
+    _calls.clear()
+
+
+@contextlib.contextmanager
+def call_budget(limit):
+    # Raise CallBudgetExceeded if the block makes more than 'limit' calls
+    global _budget
+    previous = _budget
+    _budget = (limit, total_calls())
+    try:
+        yield
+    finally:
+        _budget = previous
+
+
+### Enums
+
+class _EnumValue(int):
+    def __new__(cls, value, nick):
+        member = super().__new__(cls, value)
+        member.value_nick = nick
+        return member
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.value_nick}>"
+
+
+def _enum(name, *nicks):
+    enum_type = type(name, (_EnumValue,), {})
+    for value, nick in enumerate(nicks):
+        setattr(enum_type, nick.upper().replace("-", "_"), enum_type(value, nick))
+    return enum_type
+
+
+OrientationType = _enum("OrientationType", "horizontal", "vertical", "unknown")
+PDBStatusType = _enum("PDBStatusType", "execution-error", "calling-error", "pass-through",
+                      "success", "cancel")
+PDBProcType = _enum("PDBProcType", "internal", "plugin", "persistent", "temporary")
+RunMode = _enum("RunMode", "interactive", "noninteractive", "with-last-vals")
+ImageBaseType = _enum("ImageBaseType", "rgb", "gray", "indexed")
+ImageType = _enum("ImageType", "rgb-image", "rgba-image", "gray-image", "graya-image",
+                  "indexed-image", "indexeda-image")
+LayerMode = _enum("LayerMode", "normal")
+ChannelOps = _enum("ChannelOps", "add", "subtract", "replace", "intersect")
+FillType = _enum("FillType", "foreground", "background", "white", "transparent", "pattern")
+Precision = _enum("Precision", "u8-linear", "u8-non-linear", "u8-perceptual",
+                  "u16-linear", "u16-non-linear", "u16-perceptual",
+                  "float-linear", "float-non-linear", "float-perceptual")
+AbyssPolicy = _enum("AbyssPolicy", "none", "clamp", "loop", "black", "white")
+StrokeMethod = _enum("StrokeMethod", "line", "paint-method")
+JoinStyle = _enum("JoinStyle", "miter", "round", "bevel")
+CapStyle = _enum("CapStyle", "butt", "round", "square")
+
+U8_PRECISIONS = (Precision.U8_LINEAR, Precision.U8_NON_LINEAR, Precision.U8_PERCEPTUAL)
+
+### Colours and GEGL buffers
+
+NAMED_COLOURS = {
+    "black": (0.0, 0.0, 0.0, 1.0),
+    "white": (1.0, 1.0, 1.0, 1.0),
+}
+
+
+class Color:
+    def __init__(self, rgba=(0.0, 0.0, 0.0, 1.0)):
+        self.rgba = tuple(rgba)
+
+    @classmethod
+    def new(cls, name):
+        if name in NAMED_COLOURS:
+            return cls(NAMED_COLOURS[name])
+        name = name.lstrip("#")
+        return cls(tuple(int(name[i:i + 2], 16) / 255.0 for i in (0, 2, 4)) + (1.0,))
+
+    def get_rgba(self):
+        return self.rgba
+
+    def set_rgba(self, r, g, b, a):
+        self.rgba = (r, g, b, a)
+
+
+class Rectangle:
+    def __init__(self, x, y, width, height):
+        self.x, self.y, self.width, self.height = x, y, width, height
+
+    @classmethod
+    def new(cls, x, y, width, height):
+        return cls(x, y, width, height)
+
+
+class Buffer:
+    # A drawable's pixels (or its shadow) seen through a babl format name
+    def __init__(self, drawable, shadow=False):
+        self.drawable = drawable
+        self.shadow = shadow
+
+    def _array(self):
+        if self.shadow:
+            return self.drawable._shadow_pixels()
+        return self.drawable.pixels
+
+    def get(self, rect, scale, babl_format, abyss_policy):
+        pixels = self._array()
+        height, width = pixels.shape[:2]
+        # 'rect' is in scaled coordinates, sampled nearest-neighbour. Out of
+        # range coordinates repeat the edge pixels (AbyssPolicy.CLAMP).
+        rows = np.arange(rect.y, rect.y + rect.height)
+        cols = np.arange(rect.x, rect.x + rect.width)
+        if scale != 1.0:
+            rows = np.floor(rows / scale).astype(int)
+            cols = np.floor(cols / scale).astype(int)
+        rows = np.clip(rows, 0, height - 1)
+        cols = np.clip(cols, 0, width - 1)
+        region = _convert(pixels[np.ix_(rows, cols)], babl_format)
+        return region.tobytes()
+
+    def set(self, rect, babl_format, data):
+        pixels = self._array()
+        dtype, channels = _layout(babl_format)
+        region = _to_dtype(np.frombuffer(data, dtype=dtype).reshape(rect.height, rect.width, channels),
+                           pixels.dtype)
+        target = pixels[rect.y:rect.y + rect.height, rect.x:rect.x + rect.width]
+        if babl_format.startswith("A "):
+            target[..., 3] = region[..., 0]
+        elif channels == 1:
+            target[..., :3] = region
+        else:
+            target[..., :channels] = region
+
+    def flush(self):
+        pass
+
+
+def _layout(babl_format):
+    # (dtype, channels) of the babl formats owenjklan_core uses
+    components, _, kind = babl_format.partition(" ")
+    dtype = {"u8": np.uint8, "u16": np.uint16, "float": np.float32}[kind]
+    channels = {"A": 1, "Y'": 1, "R'G'B'": 3, "R'G'B'A": 4, "RGBA": 4}[components]
+    return dtype, channels
+
+
+def _to_dtype(values, dtype):
+    # Between 0-255 / 0-65535 integers and 0.0-1.0 floats. The fake treats
+    # linear and perceptual formats alike.
+    if values.dtype == dtype:
+        return values
+    if values.dtype != np.float32:
+        values = values.astype(np.float32) / np.iinfo(values.dtype).max
+    if dtype == np.float32:
+        return values
+    top = np.iinfo(dtype).max
+    return np.round(np.clip(values, 0.0, 1.0) * top).astype(dtype)
+
+
+def _convert(pixels, babl_format):
+    dtype, channels = _layout(babl_format)
+    components = babl_format.partition(" ")[0]
+    if components == "A":
+        pixels = pixels[..., 3]
+    elif components == "Y'":
+        r, g, b = (pixels[..., i].astype(np.float32) for i in range(3))
+        pixels = (0.2126 * r + 0.7152 * g + 0.0722 * b).astype(pixels.dtype)
+    else:
+        pixels = pixels[..., :channels]
+    return np.ascontiguousarray(_to_dtype(pixels, dtype))
+
+
+### Images and items
+
+_next_id = 1
+
+
+def _new_id():
+    global _next_id
+    _next_id += 1
+    return _next_id - 1
+
+
+_images = []
+
+
+class Item:
+    def __init__(self, image, name, width, height):
+        self.item_id = _new_id()
+        self.image = image
+        self.name = name
+        self.width = width
+        self.height = height
+        self.offset_x = 0
+        self.offset_y = 0
+        self.parent = None
+
+    @round_trip
+    def get_id(self):
+        return self.item_id
+
+    @round_trip
+    def get_name(self):
+        return self.name
+
+    @round_trip
+    def get_image(self):
+        return self.image
+
+    @round_trip
+    def get_width(self):
+        return self.width
+
+    @round_trip
+    def get_height(self):
+        return self.height
+
+    @round_trip
+    def get_offsets(self):
+        return True, self.offset_x, self.offset_y
+
+    @round_trip
+    def set_offsets(self, offset_x, offset_y):
+        self.offset_x, self.offset_y = offset_x, offset_y
+        return True
+
+    @round_trip
+    def is_group(self):
+        return False
+
+
+def _dilate_mask(mask, radius):
+    # 'mask' grown by a disk of 'radius' pixels
+    grown = mask.copy()
+    reach = int(radius)
+    height, width = mask.shape
+    for dy in range(-reach, reach + 1):
+        for dx in range(-reach, reach + 1):
+            if dx * dx + dy * dy > radius * radius or abs(dx) >= width or abs(dy) >= height:
+                continue
+            grown[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)] |= \
+                mask[max(-dy, 0):height + min(-dy, 0), max(-dx, 0):width + min(-dx, 0)]
+    return grown
+
+
+class Channel(Item):
+    # Selection masks and saved selections. 'mask' is a bool array in image
+    # coordinates, or None for an empty selection.
+    def __init__(self, image, name, mask=None):
+        super().__init__(image, name, image.width, image.height)
+        self.mask = mask
+
+    @round_trip
+    def grow(self, image, steps):
+        if self.mask is not None:
+            self.mask = _dilate_mask(self.mask, steps)
+        return True
+
+
+class Layer(Item):
+    def __init__(self, image, name, width, height, layer_type=ImageType.RGBA_IMAGE,
+                 opacity=100.0, mode=LayerMode.NORMAL):
+        super().__init__(image, name, width, height)
+        self.layer_type = layer_type
+        self.opacity = opacity
+        self.mode = mode
+        self._pixels = None
+        self._shadow = None
+        self.filters = []
+
+    @classmethod
+    @round_trip
+    def new(cls, image, name, width, height, layer_type, opacity, mode):
+        return cls(image, name, width, height, layer_type, opacity, mode)
+
+    @property
+    def pixels(self):
+        # (height, width, 4) RGBA array, allocated on first use. Not a PDB
+        # call, benchmarks use it to set up content.
+        if self._pixels is None:
+            dtype = np.uint8 if self.image.precision in U8_PRECISIONS else np.float32
+            self._pixels = np.zeros((self.height, self.width, 4), dtype=dtype)
+        return self._pixels
+
+    def _shadow_pixels(self):
+        if self._shadow is None:
+            self._shadow = self.pixels.copy()
+        return self._shadow
+
+    @round_trip
+    def has_alpha(self):
+        return self.layer_type in (ImageType.RGBA_IMAGE, ImageType.GRAYA_IMAGE,
+                                   ImageType.INDEXEDA_IMAGE)
+
+    @round_trip
+    def get_buffer(self):
+        return Buffer(self)
+
+    @round_trip
+    def get_shadow_buffer(self):
+        return Buffer(self, shadow=True)
+
+    @round_trip
+    def merge_shadow(self, push_undo):
+        # Like GIMP, only pixels inside the selection are merged
+        shadow = self._shadow_pixels()
+        mask = self.image.selection.mask
+        if mask is None:
+            self.pixels[...] = shadow
+        else:
+            inside = self.image._layer_region(self, mask)
+            self.pixels[inside] = shadow[inside]
+        self._shadow = None
+        return True
+
+    @round_trip
+    def update(self, x, y, width, height):
+        return True
+
+    @round_trip
+    def fill(self, fill_type):
+        if fill_type == FillType.TRANSPARENT:
+            self.pixels[...] = 0
+            return True
+        colour = _context["background" if fill_type == FillType.BACKGROUND else "foreground"]
+        if fill_type == FillType.WHITE:
+            colour = Color.new("white")
+        top = 255 if self.pixels.dtype == np.uint8 else 1.0
+        self.pixels[...] = _to_dtype(np.array(colour.get_rgba(), dtype=np.float32), self.pixels.dtype)
+        self.pixels[..., 3] = top
+        return True
+
+    @round_trip
+    def append_filter(self, drawable_filter):
+        self.filters.append(drawable_filter)
+        return True
+
+    @round_trip
+    def edit_stroke_selection(self):
+        # A hard-edged line of the context's width, centred on the selection
+        # boundary, painted over the layer in the foreground color
+        mask = self.image.selection.mask
+        if mask is None:
+            return False
+        half_width = _context["line-width"] * self.image.resolution[0] / 72.0 / 2.0
+        ring = _dilate_mask(mask, half_width) & _dilate_mask(~mask, half_width)
+
+        # Colors are linear RGB, layer pixels are seen as R'G'B'
+        rgba = np.array(_context["foreground"].get_rgba(), dtype=np.float32)
+        rgba[:3] = np.where(rgba[:3] <= 0.0031308, rgba[:3] * 12.92,
+                            1.055 * rgba[:3] ** (1.0 / 2.4) - 0.055)
+        rgba[3] = 1.0
+
+        painted = self.image._layer_region(self, ring)
+        self.pixels[painted] = _to_dtype(rgba, self.pixels.dtype)
+        return True
+
+    @round_trip
+    def resize(self, new_width, new_height, offset_x, offset_y):
+        # Content moves by the offset, the layer's position the other way
+        if self._pixels is not None:
+            resized = np.zeros((new_height, new_width, 4), dtype=self._pixels.dtype)
+            src_x0, src_y0 = max(0, -offset_x), max(0, -offset_y)
+            dst_x0, dst_y0 = max(0, offset_x), max(0, offset_y)
+            w = min(self.width - src_x0, new_width - dst_x0)
+            h = min(self.height - src_y0, new_height - dst_y0)
+            if w > 0 and h > 0:
+                resized[dst_y0:dst_y0 + h, dst_x0:dst_x0 + w] = \
+                    self._pixels[src_y0:src_y0 + h, src_x0:src_x0 + w]
+            self._pixels = resized
+        self.width, self.height = new_width, new_height
+        self.offset_x -= offset_x
+        self.offset_y -= offset_y
+        return True
+
+
+class FilterConfig:
+    def __init__(self, properties):
+        self.properties = dict(properties)
+
+    def get_property(self, name):
+        return self.properties[name]
+
+    def set_property(self, name, value):
+        if name not in self.properties:
+            raise TypeError(f"filter has no property '{name}'")
+        self.properties[name] = value
+
+
+# Operation -> default properties of the filters DrawableFilter.new() knows
+FILTER_OPERATIONS = {
+    "gimp:set-alpha": {"value": 1.0},
+}
+
+
+class DrawableFilter:
+    # Only records the operation and its properties, the layer's pixels are
+    # never rendered through it
+    def __init__(self, drawable, operation, name):
+        self.drawable = drawable
+        self.operation = operation
+        self.name = name
+        self.config = FilterConfig(FILTER_OPERATIONS[operation])
+
+    @classmethod
+    @round_trip
+    def new(cls, drawable, operation, name):
+        # None for an unknown operation, like GIMP
+        if operation not in FILTER_OPERATIONS:
+            return None
+        return cls(drawable, operation, name)
+
+    def get_config(self):
+        return self.config
+
+    @round_trip
+    def update(self):
+        return True
+
+
+class GroupLayer(Layer):
+    def __init__(self, image, name):
+        super().__init__(image, name, 0, 0)
+        self.children = []
+
+    @classmethod
+    @round_trip
+    def new(cls, image, name=""):
+        return cls(image, name)
+
+    @round_trip
+    def is_group(self):
+        return True
+
+    @round_trip
+    def get_children(self):
+        return list(self.children)
+
+
+class Image:
+    def __init__(self, width, height, base_type=ImageBaseType.RGB, precision=Precision.U8_NON_LINEAR):
+        self.image_id = _new_id()
+        self.width = width
+        self.height = height
+        self.base_type = base_type
+        self.precision = precision
+        self.resolution = (72.0, 72.0)
+        self.layers = []
+        self.selected_layers = []
+        self.channels = []
+        self.selection = Channel(self, "Selection")
+        # Guide ID -> (orientation, position). IDs only ever grow, so the
+        # sorted ID list is also creation order.
+        self.guides = {}
+        self.guide_ids = []
+        self.undo_depth = 0
+        self.undo_enabled = True
+        self.frozen = 0
+        _images.append(self)
+
+    @classmethod
+    @round_trip
+    def new(cls, width, height, base_type):
+        return cls(width, height, base_type)
+
+    def _layer_region(self, layer, mask):
+        # The part of an image-space mask covering 'layer', in layer space
+        region = np.zeros((layer.height, layer.width), dtype=bool)
+        x0, y0 = max(layer.offset_x, 0), max(layer.offset_y, 0)
+        x1 = min(layer.offset_x + layer.width, self.width)
+        y1 = min(layer.offset_y + layer.height, self.height)
+        if x1 > x0 and y1 > y0:
+            region[y0 - layer.offset_y:y1 - layer.offset_y, x0 - layer.offset_x:x1 - layer.offset_x] = \
+                mask[y0:y1, x0:x1]
+        return region
+
+    ### Image
+
+    @round_trip
+    def get_id(self):
+        return self.image_id
+
+    @round_trip
+    def get_width(self):
+        return self.width
+
+    @round_trip
+    def get_height(self):
+        return self.height
+
+    @round_trip
+    def get_precision(self):
+        return self.precision
+
+    @round_trip
+    def get_resolution(self):
+        return (True,) + self.resolution
+
+    @round_trip
+    def resize(self, new_width, new_height, offset_x, offset_y):
+        # Layers and guides move with the content, guides that end up off
+        # the canvas are removed
+        self.width, self.height = new_width, new_height
+        for layer in self.layers:
+            layer.offset_x += offset_x
+            layer.offset_y += offset_y
+        for guide_id in list(self.guide_ids):
+            orientation, position = self.guides[guide_id]
+            position += offset_y if orientation == OrientationType.HORIZONTAL else offset_x
+            limit = new_height if orientation == OrientationType.HORIZONTAL else new_width
+            if 0 <= position <= limit:
+                self.guides[guide_id] = (orientation, position)
+            else:
+                self._remove_guide(guide_id)
+        self.selection.mask = None
+        return True
+
+    @round_trip
+    def delete(self):
+        if self in _images:
+            _images.remove(self)
+        return True
+
+    @round_trip
+    def undo_group_start(self):
+        self.undo_depth += 1
+        return True
+
+    @round_trip
+    def undo_group_end(self):
+        self.undo_depth -= 1
+        return True
+
+    @round_trip
+    def undo_disable(self):
+        self.undo_enabled = False
+        return True
+
+    @round_trip
+    def undo_enable(self):
+        self.undo_enabled = True
+        return True
+
+    @round_trip
+    def freeze_layers(self):
+        self.frozen += 1
+
+    @round_trip
+    def thaw_layers(self):
+        self.frozen -= 1
+
+    ### Layers
+
+    @round_trip
+    def get_layers(self):
+        return list(self.layers)
+
+    @round_trip
+    def get_selected_layers(self):
+        return list(self.selected_layers)
+
+    @round_trip
+    def set_selected_layers(self, layers):
+        self.selected_layers = list(layers)
+        return True
+
+    @round_trip
+    def get_layer_by_name(self, name):
+        pending = list(self.layers)
+        while pending:
+            layer = pending.pop(0)
+            if layer.name == name:
+                return layer
+            if isinstance(layer, GroupLayer):
+                pending.extend(layer.children)
+        return None
+
+    @round_trip
+    def insert_layer(self, layer, parent, position):
+        siblings = parent.children if parent is not None else self.layers
+        position = len(siblings) if position < 0 else min(position, len(siblings))
+        siblings.insert(position, layer)
+        layer.parent = parent
+        self.selected_layers = [layer]
+        return True
+
+    @round_trip
+    def remove_layer(self, layer):
+        siblings = layer.parent.children if layer.parent is not None else self.layers
+        siblings.remove(layer)
+        self.selected_layers = [l for l in self.selected_layers if l is not layer]
+        return True
+
+    ### Channels and selection
+
+    @round_trip
+    def get_selection(self):
+        return self.selection
+
+    @round_trip
+    def select_rectangle(self, operation, x, y, width, height):
+        mask = np.zeros((self.height, self.width), dtype=bool)
+        mask[max(y, 0):y + height, max(x, 0):x + width] = True
+        self._combine_selection(operation, mask)
+        return True
+
+    @round_trip
+    def select_item(self, operation, item):
+        if isinstance(item, Channel):
+            mask = item.mask if item.mask is not None else np.zeros((self.height, self.width), dtype=bool)
+        else:
+            mask = np.zeros((self.height, self.width), dtype=bool)
+            x0, y0 = max(item.offset_x, 0), max(item.offset_y, 0)
+            x1 = min(item.offset_x + item.width, self.width)
+            y1 = min(item.offset_y + item.height, self.height)
+            if x1 > x0 and y1 > y0:
+                alpha = item.pixels[y0 - item.offset_y:y1 - item.offset_y,
+                                    x0 - item.offset_x:x1 - item.offset_x, 3]
+                mask[y0:y1, x0:x1] = alpha > 0
+        self._combine_selection(operation, mask)
+        return True
+
+    def _combine_selection(self, operation, mask):
+        current = self.selection.mask
+        if current is None:
+            current = np.zeros_like(mask)
+        if operation == ChannelOps.ADD:
+            mask = current | mask
+        elif operation == ChannelOps.SUBTRACT:
+            mask = current & ~mask
+        elif operation == ChannelOps.INTERSECT:
+            mask = current & mask
+        self.selection.mask = mask if mask.any() else None
+
+    @round_trip
+    def remove_channel(self, channel):
+        if channel in self.channels:
+            self.channels.remove(channel)
+        return True
+
+    ### Guides
+
+    def _remove_guide(self, guide_id):
+        del self.guides[guide_id]
+        del self.guide_ids[bisect.bisect_left(self.guide_ids, guide_id)]
+
+    def _add_guide(self, orientation, position):
+        guide_id = _new_id()
+        self.guides[guide_id] = (orientation, position)
+        self.guide_ids.append(guide_id)
+        return guide_id
+
+    @round_trip
+    def add_hguide(self, position):
+        return self._add_guide(OrientationType.HORIZONTAL, position)
+
+    @round_trip
+    def add_vguide(self, position):
+        return self._add_guide(OrientationType.VERTICAL, position)
+
+    @round_trip
+    def delete_guide(self, guide_id):
+        if guide_id not in self.guides:
+            return False
+        self._remove_guide(guide_id)
+        return True
+
+    @round_trip
+    def find_next_guide(self, guide_id):
+        # 0 starts the walk and also ends it
+        index = bisect.bisect_right(self.guide_ids, guide_id)
+        return self.guide_ids[index] if index < len(self.guide_ids) else 0
+
+    @round_trip
+    def get_guide_orientation(self, guide_id):
+        if guide_id not in self.guides:
+            return OrientationType.UNKNOWN
+        return self.guides[guide_id][0]
+
+    @round_trip
+    def get_guide_position(self, guide_id):
+        if guide_id not in self.guides:
+            return -1
+        return self.guides[guide_id][1]
+
+
+class Selection:
+    @staticmethod
+    @round_trip
+    def is_empty(image):
+        return image.selection.mask is None
+
+    @staticmethod
+    @round_trip
+    def none(image):
+        image.selection.mask = None
+        return True
+
+    @staticmethod
+    @round_trip
+    def all(image):
+        image.selection.mask = np.ones((image.height, image.width), dtype=bool)
+        return True
+
+    @staticmethod
+    @round_trip
+    def save(image):
+        mask = image.selection.mask
+        channel = Channel(image, "Selection Mask copy", None if mask is None else mask.copy())
+        image.channels.append(channel)
+        return channel
+
+
+### Context and messages
+
+_context = {
+    "foreground": Color.new("black"),
+    "background": Color.new("white"),
+    # In points, see Unit
+    "line-width": 6.0,
+}
+_context_stack = []
+
+# Every Gimp.message(), oldest first
+messages = []
+
+
+@round_trip
+def context_push():
+    _context_stack.append(dict(_context))
+    return True
+
+
+@round_trip
+def context_pop():
+    _context.clear()
+    _context.update(_context_stack.pop())
+    return True
+
+
+@round_trip
+def context_get_foreground():
+    return _context["foreground"]
+
+
+@round_trip
+def context_set_foreground(colour):
+    _context["foreground"] = colour
+    return True
+
+
+@round_trip
+def context_get_background():
+    return _context["background"]
+
+
+@round_trip
+def context_set_background(colour):
+    _context["background"] = colour
+    return True
+
+
+@round_trip
+def context_set_line_width(line_width):
+    _context["line-width"] = line_width
+    return True
+
+
+@round_trip
+def context_set_line_width_unit(unit):
+    # Line widths are always points, the only unit auto-outline uses
+    return True
+
+
+@round_trip
+def context_set_antialias(antialias):
+    return True
+
+
+@round_trip
+def context_set_brush_hardness(hardness):
+    return True
+
+
+@round_trip
+def context_set_stroke_method(method):
+    return True
+
+
+# Stroke settings the fake's hard-edged stroke ignores
+@round_trip
+def context_set_line_join_style(join_style):
+    return True
+
+
+@round_trip
+def context_set_line_cap_style(cap_style):
+    return True
+
+
+@round_trip
+def context_set_line_miter_limit(miter_limit):
+    return True
+
+
+@round_trip
+def context_set_line_dash_offset(dash_offset):
+    return True
+
+
+@round_trip
+def context_set_line_dash_pattern(dashes):
+    return True
+
+
+@round_trip
+def context_set_opacity(opacity):
+    return True
+
+
+@round_trip
+def context_set_paint_mode(paint_mode):
+    return True
+
+
+class Unit:
+    @staticmethod
+    def point():
+        return "point"
+
+
+@round_trip
+def pixels_to_units(pixels, unit, resolution):
+    return pixels * 72.0 / resolution
+
+
+@round_trip
+def message(text):
+    messages.append(text)
+    return True
+
+
+@round_trip
+def displays_flush():
+    pass
+
+
+@round_trip
+def get_images():
+    return list(_images)
+
+
+def directory():
+    return os.path.join(tempfile.gettempdir(), "fake-gimp")
+
+
+### Procedures and the PDB
+
+class Int32Array:
+    pass
+
+
+class Value:
+    def __init__(self, value_type=None, value=None):
+        self.value_type = value_type
+        self.value = value
+
+
+def value_set_int32_array(value, values):
+    value.value = list(values)
+
+
+def value_get_int32_array(value):
+    return value.value
+
+
+class GError:
+    def __init__(self, message=""):
+        self.message = message
+
+
+class ValueArray:
+    def __init__(self, values):
+        self.values = list(values)
+
+    def index(self, index):
+        value = self.values[index]
+        return value.value if isinstance(value, Value) else value
+
+    def length(self):
+        return len(self.values)
+
+    def remove(self, index):
+        del self.values[index]
+
+    def insert(self, index, value):
+        self.values.insert(index, value)
+
+
+class ProcedureConfig:
+    def __init__(self, procedure):
+        self.procedure = procedure
+        self.properties = {"run-mode": RunMode.NONINTERACTIVE, "image": None, "drawables": []}
+        for argument in procedure.arguments:
+            self.properties[argument["name"]] = argument["default"]
+
+    def get_property(self, name):
+        if name not in self.properties:
+            raise TypeError(f"{self.procedure.name} has no property '{name}'")
+        return self.properties[name]
+
+    def set_property(self, name, value):
+        if name not in self.properties:
+            raise TypeError(f"{self.procedure.name} has no property '{name}'")
+        # Like GObject, refuse values of the wrong type for typed arguments
+        current = self.properties[name]
+        if isinstance(current, (bool, int, float, str)) and not _same_kind(current, value):
+            raise TypeError(f"{self.procedure.name}: '{name}' must be {type(current).__name__},"
+                            f" not {type(value).__name__}")
+        self.properties[name] = value
+
+
+def _same_kind(current, value):
+    if isinstance(current, bool) or isinstance(value, bool):
+        return isinstance(current, bool) and isinstance(value, bool)
+    if isinstance(current, (int, float)):
+        return isinstance(value, (int, float))
+    return isinstance(value, type(current))
+
+
+class Procedure:
+    # run_function has the Gimp.ImageProcedure signature:
+    # (procedure, run_mode, image, drawables, config, run_data)
+    def __init__(self, name, run_function, run_data=None, arguments=(), return_values=(),
+                 menu_label=""):
+        self.name = name
+        self.run_function = run_function
+        self.run_data = run_data
+        self.arguments = list(arguments)
+        self.return_values = list(return_values)
+        self.menu_label = menu_label
+
+    def get_name(self):
+        return self.name
+
+    def get_menu_label(self):
+        return self.menu_label
+
+    @round_trip
+    def create_config(self):
+        return ProcedureConfig(self)
+
+    def new_return_values(self, status, error):
+        return ValueArray([status] + [None] * len(self.return_values))
+
+    @round_trip
+    def run(self, config):
+        return self.run_function(self, config.get_property("run-mode"), config.get_property("image"),
+                                 config.get_property("drawables"), config, self.run_data)
+
+
+class PDB:
+    def __init__(self):
+        self.procedures = {}
+        self.last_error = ""
+
+    def register(self, procedure):
+        self.procedures[procedure.name] = procedure
+
+    @round_trip
+    def lookup_procedure(self, name):
+        return self.procedures.get(name)
+
+    def get_last_error(self):
+        return self.last_error
+
+
+_pdb = PDB()
+
+
+def get_pdb():
+    return _pdb
+
+
+def _gimp_layer_new(procedure, run_mode, image, drawables, config, run_data):
+    layer = Layer(image, config.get_property("name"), config.get_property("width"),
+                  config.get_property("height"), config.get_property("type"),
+                  config.get_property("opacity"), config.get_property("mode"))
+    return ValueArray([PDBStatusType.SUCCESS, layer])
+
+
+_pdb.register(Procedure("gimp-layer-new", _gimp_layer_new, arguments=[
+    {"name": name, "default": default} for name, default in (
+        ("width", 1), ("height", 1), ("type", ImageType.RGBA_IMAGE), ("name", ""),
+        ("opacity", 100.0), ("mode", LayerMode.NORMAL))
+], return_values=[{"name": "layer"}]))
+
+
+def register_owenjklan_procedures():
+    # Register every procedure of the owenjklan_core.procedures table,
+    # dispatched through owenjklan_core.plugin like the real plug-ins
+    from owenjklan_core.plugin import run_procedure
+    from owenjklan_core.procedures import PROCEDURES
+
+    for name, details in PROCEDURES.items():
+        _pdb.register(Procedure(name, run_procedure, name, details.get("arguments", []),
+                                details.get("return_values", []), details["label"]))
+
+
+class PlugIn:
+    pass
+
+
+def main(gtype, argv):
+    raise RuntimeError("fake_gimp cannot run plug-ins, call their procedures instead")
+
+
+### Installation
+
+def install():
+    # Put the fake modules in sys.modules (idempotent) and register the
+    # owenjklan procedures. Must run before owenjklan_core is imported.
+    gimp = sys.modules[__name__]
+    if sys.modules.get("gi.repository.Gimp") is gimp:
+        return
+
+    gi = types.ModuleType("gi")
+    gi.require_version = lambda namespace, version: None
+    repository = types.ModuleType("gi.repository")
+    gi.repository = repository
+
+    glib = types.ModuleType("gi.repository.GLib")
+    glib.Error = GError
+
+    gobject = types.ModuleType("gi.repository.GObject")
+    gobject.Value = Value
+    gobject.ParamFlags = _enum("ParamFlags", "readable", "writable", "readwrite")
+
+    gegl = types.ModuleType("gi.repository.Gegl")
+    gegl.Rectangle = Rectangle
+    gegl.Color = Color
+    gegl.AbyssPolicy = AbyssPolicy
+
+    gio = types.ModuleType("gi.repository.Gio")
+
+    modules = {"Gimp": gimp, "GLib": glib, "GObject": gobject, "Gegl": gegl, "Gio": gio}
+    for name, module in modules.items():
+        setattr(repository, name, module)
+        sys.modules["gi.repository." + name] = module
+    sys.modules["gi"] = gi
+    sys.modules["gi.repository"] = repository
+
+    register_owenjklan_procedures()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+
+###
+# Micro-benchmarks of the guide group and centered resize logic, run
+# against benchmarks/fake_gimp.py instead of a real GIMP.
+#
+# Each scenario builds an image with N guides or N layers, runs a procedure
+# through the (fake) PDB and records its time and the number of PDB round
+# trips it made. Round trips are checked against a budget that is linear in
+# N, eg. removing a guide group may cost one walk over the guides plus one
+# delete per guide, and the run exits non-zero if any scenario goes over.
+#
+#   python3 benchmarks/micro.py --sizes 10 100 1000 10000 --repeat 5
+#   python3 -m cProfile -s cumtime benchmarks/micro.py --scenarios remove-guides
+#
+# Some scenarios also check their result ("thirds-round-trip" adds and then
+# removes thirds on an odd-sized image, where the thirds are not whole
+# pixels, and expects no guide to be left at them; "quick-black-filter"
+# expects a filter and no pixel buffer on the new layer).
+#
+# The "legacy-remove-guides" scenario replays the guide removal loop from
+# before owenjklan_core.guides, which never advances past a guide that does
+# not match. It is expected to hit its budget instead of terminating.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+
+import fake_gimp
+
+fake_gimp.install()
+
+from fake_gimp import OrientationType
+
+# Round trips of looking up and running a procedure wrapped by
+# procedure_runner: lookup, config, run, context push/pop, undo group,
+# display flush and the message
+RUNNER_CALLS = 9
+
+QUARTERS = [25, 50, 75]
+THIRDS = [33, 66]
+
+
+class ScenarioFailed(Exception):
+    pass
+
+
+def guided_image(guides, width=3840, height=2160):
+    # Guides at random positions, plus one at each quarter so removals
+    # have something to match
+    image = fake_gimp.Image(width, height)
+    rng = random.Random(guides)
+    for i in range(guides):
+        if i % 2:
+            image.add_hguide(rng.randint(0, height))
+        else:
+            image.add_vguide(rng.randint(0, width))
+    for percent in QUARTERS:
+        image.add_hguide(round(height * percent / 100.0))
+        image.add_vguide(round(width * percent / 100.0))
+    return image
+
+
+def layered_image(layers, width=3840, height=2160):
+    image = fake_gimp.Image(width, height)
+    for i in range(layers):
+        layer = fake_gimp.Layer(image, f"Layer {i}", width // 2, height // 2)
+        image.insert_layer(layer, None, 0)
+    return image
+
+
+def run_procedure(name, image, **arguments):
+    procedure = fake_gimp.get_pdb().lookup_procedure(name)
+    config = procedure.create_config()
+    config.set_property("image", image)
+    # GIMP passes the drawables in, not a call the procedure makes
+    config.set_property("drawables", image.selected_layers)
+    for argument_name, value in arguments.items():
+        config.set_property(argument_name.replace("_", "-"), value)
+
+    results = procedure.run(config)
+    if results.index(0) != fake_gimp.PDBStatusType.SUCCESS:
+        raise RuntimeError(f"{name} returned {results.index(0).value_nick}")
+
+
+def thirds_round_trip(image):
+    # Add thirds, remove them with no tolerance, and expect none left
+    run_procedure("owenjklan-add-guide-groups-thirds", image)
+    run_procedure("owenjklan-remove-guide-groups-thirds", image, tolerance=0)
+
+    targets = {round(image.width * percent / 100.0) for percent in THIRDS}
+    targets |= {round(image.height * percent / 100.0) for percent in THIRDS}
+    left = [position for _, position in image.guides.values() if position in targets]
+    if left:
+        raise ScenarioFailed(f"guides left at {sorted(left)}")
+
+
+def quick_black_filter(image):
+    # The filter fill mode must leave the new layer's pixels unallocated
+    run_procedure("owenjklan-quick-black-top", image, fill_mode="filter")
+
+    layer = image.layers[0]
+    operations = [drawable_filter.operation for drawable_filter in layer.filters]
+    if layer.name != "Quick Black" or operations != ["gimp:set-alpha"]:
+        raise ScenarioFailed(f"top layer {layer.name!r} has filters {operations}")
+    if layer._pixels is not None:
+        raise ScenarioFailed("the filter mode allocated the layer's pixels")
+
+
+def legacy_remove_guides_at_percentages(image, positions):
+    # The removal loop as it was before GuideIndex, kept to reproduce its
+    # hang: guide_id only advances when a guide is removed
+    image_width = image.get_width()
+    image_height = image.get_height()
+    pixel_h_positions = set([image_height * (pos / 100.0) for pos in positions])
+    pixel_w_positions = set([image_width * (pos / 100.0) for pos in positions])
+
+    guide_id = image.find_next_guide(0)
+    while guide_id != 0:
+        orientation = image.get_guide_orientation(guide_id)
+        position = image.get_guide_position(guide_id)
+        if orientation == OrientationType.HORIZONTAL:
+            if position in pixel_h_positions:
+                next_guide_id = image.find_next_guide(guide_id)
+                image.delete_guide(guide_id)
+                guide_id = next_guide_id
+                pixel_h_positions.remove(position)
+        elif orientation == OrientationType.VERTICAL:
+            if position in pixel_w_positions:
+                next_guide_id = image.find_next_guide(guide_id)
+                image.delete_guide(guide_id)
+                guide_id = next_guide_id
+                pixel_w_positions.remove(position)
+        else:
+            guide_id = image.find_next_guide(guide_id)
+
+
+# A guide walk is find_next_guide per guide plus the final one, and the
+# orientation and position of each guide
+def guide_walk(n):
+    return 3 * n + 1
+
+
+# Scenario -> (setup(n), run(image), budget(n) in round trips, expect_runaway)
+SCENARIOS = {
+    "add-guides": (
+        guided_image,
+        lambda image: run_procedure("owenjklan-add-guide-groups-quarters", image),
+        # Walk, image size, at most two guides per percentage
+        lambda n: RUNNER_CALLS + guide_walk(n + 6) + 2 + 6,
+        False,
+    ),
+    "remove-guides": (
+        guided_image,
+        lambda image: run_procedure("owenjklan-remove-guide-groups-quarters", image),
+        # Walk, image size, at most one delete per guide
+        lambda n: RUNNER_CALLS + guide_walk(n + 6) + 2 + (n + 6),
+        False,
+    ),
+    "guide-grid": (
+        guided_image,
+        lambda image: run_procedure("owenjklan-add-guide-grid", image, divisions=10, margin=32),
+        # Walk, image size, undo group, 9 divisions and 2 margins per axis
+        lambda n: RUNNER_CALLS + guide_walk(n + 6) + 2 + 2 + 22,
+        False,
+    ),
+    "thirds-round-trip": (
+        lambda n: guided_image(n, 1081, 1081),
+        thirds_round_trip,
+        # Two runs: walk, image size and at most two adds per percentage,
+        # then walk, image size and at most one delete per guide
+        lambda n: 2 * RUNNER_CALLS + guide_walk(n + 6) + 2 + 4
+                  + guide_walk(n + 10) + 2 + (n + 10),
+        False,
+    ),
+    "list-guides": (
+        guided_image,
+        lambda image: run_procedure("owenjklan-list-guides", image),
+        # Not wrapped by procedure_runner: lookup, config and run only
+        lambda n: 3 + guide_walk(n + 6),
+        False,
+    ),
+    "layer-resize": (
+        layered_image,
+        lambda image: run_procedure("owenjklan-layer-boundary-centered-resize", image,
+                                    scope="all-layers"),
+        # Layer list, undo group, freeze/thaw, then is_group, size and
+        # resize per layer
+        lambda n: RUNNER_CALLS + 1 + 2 + 2 + 4 * n,
+        False,
+    ),
+    "canvas-resize": (
+        layered_image,
+        lambda image: run_procedure("owenjklan-image-canvas-centered-resize", image),
+        # Independent of the number of layers
+        lambda n: RUNNER_CALLS + 2 + 2 + 1,
+        False,
+    ),
+    "quick-black-filter": (
+        layered_image,
+        quick_black_filter,
+        # gimp-layer-new's lookup, config and run, image size, insert, then
+        # creating, updating and appending the filter. Independent of the
+        # number of layers.
+        lambda n: RUNNER_CALLS + 3 + 2 + 1 + 3,
+        False,
+    ),
+    "legacy-remove-guides": (
+        guided_image,
+        lambda image: legacy_remove_guides_at_percentages(image, QUARTERS),
+        lambda n: 10 * (n + 6),
+        True,
+    ),
+}
+
+
+def run_scenario(name, n, repeat):
+    setup, run, budget, expect_runaway = SCENARIOS[name]
+    limit = budget(n)
+
+    timings = []
+    failure = None
+    for _ in range(repeat):
+        image = setup(n)
+        fake_gimp.reset_calls()
+        start = time.perf_counter()
+        try:
+            # list-guides prints every guide
+            with fake_gimp.call_budget(limit), contextlib.redirect_stdout(io.StringIO()):
+                run(image)
+            runaway = False
+        except fake_gimp.CallBudgetExceeded:
+            runaway = True
+        except ScenarioFailed as e:
+            runaway = False
+            failure = str(e)
+        timings.append(time.perf_counter() - start)
+        calls = fake_gimp.total_calls()
+        image.delete()
+
+        if runaway or failure:
+            break
+
+    return {
+        "scenario": name,
+        "n": n,
+        "seconds": round(statistics.median(timings), 6),
+        "calls": calls,
+        "budget": limit,
+        "runaway": runaway,
+        "failure": failure,
+        "ok": runaway == expect_runaway and failure is None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time owenjklan procedures against a fake GIMP "
+                                                 "and check their PDB call budgets.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000, 10000],
+                        help="Numbers of guides (or layers) per image")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3, help="Samples per scenario and size")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.scenarios:
+        for n in args.sizes:
+            result = run_scenario(name, n, args.repeat)
+            verdict = "ok" if result["ok"] else "OVER BUDGET"
+            if result["runaway"] and result["ok"]:
+                verdict = "runaway (expected)"
+            elif result["failure"]:
+                verdict = f"FAILED: {result['failure']}"
+            elif not result["runaway"] and not result["ok"]:
+                verdict = "terminated (expected runaway)"
+            print(f"{name:<22} n={n:<6} {result['seconds'] * 1000.0:>10.3f} ms"
+                  f" {result['calls']:>7}/{result['budget']:<7} calls  {verdict}")
+            results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+
+    return 0 if all(result["ok"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
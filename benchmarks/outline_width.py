@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+###
+# Checks that the numpy engine's outline (owenjklan_core.outline) is as
+# wide as the stroke engine's: a straight content edge outlined with line
+# width w gets w fully opaque pixels, then at most one partly transparent
+# pixel. Needs NumPy only, no GIMP. Exits non-zero on a mismatch.
+#
+#   python3 benchmarks/outline_width.py --widths 1 2 3 6 12
+
+import argparse
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+
+import numpy as np
+
+from owenjklan_core import outline
+
+
+def edge_profile(line_width, size=64):
+    # Outline alpha of the row through the middle, from the right edge of
+    # an opaque block outwards
+    alpha = np.zeros((size, size), dtype=np.uint8)
+    alpha[:, :size // 2] = 255
+    dilated = outline.dilate_alpha(alpha, line_width)
+    return dilated[size // 2, size // 2:].tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the numpy outline's width against the line width.")
+    parser.add_argument("--widths", nargs="+", type=int, default=[1, 2, 3, 6, 12])
+    args = parser.parse_args()
+
+    ok = True
+    for line_width in args.widths:
+        profile = edge_profile(line_width)
+        opaque = profile[:line_width] == [255] * line_width
+        # The antialiased rim is at most one pixel, and never opaque
+        rest = profile[line_width:]
+        rim = rest[0] < 255 and not any(rest[1:])
+        width_ok = opaque and rim
+        ok = ok and width_ok
+        print(f"line width {line_width:>3}: {profile[:line_width + 2]} {'ok' if width_ok else 'WRONG WIDTH'}")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+###
+# Read and write throughput of owenjklan_core.pixels across buffer sizes and
+# pixel formats: whole-region reads, tiled reads under a memory budget,
+# writes through the shadow buffer and tiled fills.
+#
+# By default each run is one gimp-console process measuring real GEGL
+# buffers. --fake measures against benchmarks/fake_gimp.py instead, which
+# only checks the code paths (its numbers say nothing about GEGL).
+#
+#   python3 benchmarks/pixel_access.py --sizes 1K 4K 8K --repeat 3
+#   python3 benchmarks/pixel_access.py --fake --sizes 256 1K
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), "scripts")
+
+SIZES = {
+    "256": (256, 256),
+    "1K": (1024, 576),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+    "16K": (15360, 8640),
+}
+
+FORMATS = ["R'G'B'A u8", "R'G'B'A float", "A u8"]
+
+RESULT_MARKER = "PIXEL-ACCESS-RESULT "
+
+BATCH_CODE = (
+    "import sys; sys.path.insert(0, {scripts_dir!r}); sys.path.insert(0, {benchmarks_dir!r}); "
+    "import pixel_access; pixel_access.print_results({sizes!r}, {formats!r}, {repeat!r}, {tile_mb!r})"
+)
+
+
+def median_seconds(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def measure(sizes, formats, repeat, tile_mb):
+    # Runs inside GIMP (or with fake_gimp installed)
+    import gi
+    gi.require_version('Gimp', '3.0')
+    from gi.repository import Gimp
+
+    from owenjklan_core import pixels
+
+    tile_bytes = int(tile_mb * 1024 * 1024)
+    results = []
+    for size in sizes:
+        width, height = SIZES[size]
+        image = Gimp.Image.new(width, height, Gimp.ImageBaseType.RGB)
+        image.undo_disable()
+        layer = Gimp.Layer.new(image, "Benchmark", width, height, Gimp.ImageType.RGBA_IMAGE,
+                               100.0, Gimp.LayerMode.NORMAL)
+        image.insert_layer(layer, None, 0)
+
+        for babl_format in formats:
+            dtype, channels = pixels.format_layout(babl_format)
+            megabytes = width * height * channels * dtype().itemsize / (1024.0 * 1024.0)
+            array = pixels.read_pixels(layer, 0, 0, width, height, babl_format)
+
+            def tiled_read():
+                for _ in pixels.iter_tiles(layer, 0, 0, width, height, babl_format, tile_bytes):
+                    pass
+
+            timings = {
+                "read": median_seconds(
+                    lambda: pixels.read_pixels(layer, 0, 0, width, height, babl_format), repeat),
+                "read_writable": median_seconds(
+                    lambda: pixels.read_pixels(layer, 0, 0, width, height, babl_format, writable=True),
+                    repeat),
+                "tiled_read": median_seconds(tiled_read, repeat),
+                "write": median_seconds(
+                    lambda: pixels.write_pixels(layer, array, 0, 0, babl_format), repeat),
+                "tiled_fill": median_seconds(
+                    lambda: pixels.fill_pixels(layer, 0, babl_format=babl_format, max_bytes=tile_bytes),
+                    repeat),
+            }
+            for operation, seconds in timings.items():
+                results.append({
+                    "size": size,
+                    "format": babl_format,
+                    "operation": operation,
+                    "megabytes": round(megabytes, 2),
+                    "seconds": round(seconds, 6),
+                    "mb_per_second": round(megabytes / seconds, 1) if seconds else None,
+                })
+
+        image.delete()
+    return results
+
+
+def print_results(sizes, formats, repeat, tile_mb):
+    for result in measure(sizes, formats, repeat, tile_mb):
+        print(RESULT_MARKER + json.dumps(result), flush=True)
+
+
+def run_in_gimp(gimp_console, sizes, formats, repeat, tile_mb):
+    code = BATCH_CODE.format(scripts_dir=SCRIPTS_DIR, benchmarks_dir=BENCHMARKS_DIR,
+                             sizes=sizes, formats=formats, repeat=repeat, tile_mb=tile_mb)
+    output = subprocess.run([gimp_console, "-i", "--batch-interpreter=python-fu-eval", "-b", code, "--quit"],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+    return [json.loads(line[len(RESULT_MARKER):]) for line in output.splitlines()
+            if line.startswith(RESULT_MARKER)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure pixel read/write throughput of owenjklan_core.pixels.")
+    parser.add_argument("--gimp-console", default="gimp-console-3.0")
+    parser.add_argument("--fake", action="store_true", help="Use benchmarks/fake_gimp.py instead of GIMP")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["256", "1K", "4K", "8K"])
+    parser.add_argument("--formats", nargs="+", default=FORMATS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tile-mb", type=float, default=16.0, help="Memory budget of tiled operations")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    if args.fake:
+        sys.path.insert(0, SCRIPTS_DIR)
+        import fake_gimp
+        fake_gimp.install()
+        results = measure(args.sizes, args.formats, args.repeat, args.tile_mb)
+    else:
+        results = run_in_gimp(args.gimp_console, args.sizes, args.formats, args.repeat, args.tile_mb)
+
+    if not results:
+        print("No results, is gimp-console installed with the owenjklan plug-ins?")
+        return 1
+
+    for result in results:
+        print(f"{result['size']:>4} {result['format']:<14} {result['operation']:<14}"
+              f" {result['megabytes']:>9.2f} MB {result['seconds'] * 1000.0:>10.2f} ms"
+              f" {result['mb_per_second']:>9} MB/s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
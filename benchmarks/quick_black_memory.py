@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+###
+# Peak memory of owenjklan-quick-black-top with each fill mode on a large
+# canvas.
+#
+# Every sample is a fresh gimp-console process that creates a WIDTHxHEIGHT
+# image with one layer, then either does nothing ("baseline") or runs
+# owenjklan-quick-black-top with the given fill mode. Peak RSS of the
+# gimp-console process (including its plug-in processes) is taken from
+# os.wait4(), and reported relative to the baseline.
+#
+#   python3 benchmarks/quick_black_memory.py --gimp-console gimp-console-3.0 \
+#       --width 7680 --height 4320
+
+import argparse
+import json
+import os
+import subprocess
+
+BATCH_CODE = """
+import gi
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+image = Gimp.Image.new({width}, {height}, Gimp.ImageBaseType.RGB)
+layer = Gimp.Layer.new(image, "Background", {width}, {height},
+                       Gimp.ImageType.RGBA_IMAGE, 100.0, Gimp.LayerMode.NORMAL)
+image.insert_layer(layer, None, 0)
+fill_mode = {fill_mode!r}
+if fill_mode != "baseline":
+    procedure = Gimp.get_pdb().lookup_procedure("owenjklan-quick-black-top")
+    config = procedure.create_config()
+    config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+    config.set_property("image", image)
+    config.set_property("drawables", [layer])
+    config.set_property("fill-mode", fill_mode)
+    procedure.run(config)
+"""
+
+
+def peak_rss_kb(gimp_console, width, height, fill_mode):
+    code = BATCH_CODE.format(width=width, height=height, fill_mode=fill_mode)
+    process = subprocess.Popen([gimp_console, "-i", "--batch-interpreter=python-fu-eval",
+                                "-b", code, "--quit"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError(f"gimp-console failed for fill mode '{fill_mode}'")
+    # ru_maxrss is in kilobytes on Linux
+    return usage.ru_maxrss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of quick-black fill modes.")
+    parser.add_argument("--gimp-console", default="gimp-console-3.0")
+    parser.add_argument("--width", type=int, default=7680)
+    parser.add_argument("--height", type=int, default=4320)
+    args = parser.parse_args()
+
+    results = {"width": args.width, "height": args.height}
+    baseline = peak_rss_kb(args.gimp_console, args.width, args.height, "baseline")
+    results["baseline_peak_rss_mb"] = round(baseline / 1024.0, 1)
+
+    for fill_mode in ("pixels", "filter"):
+        peak = peak_rss_kb(args.gimp_console, args.width, args.height, fill_mode)
+        results[f"{fill_mode}_peak_rss_mb"] = round(peak / 1024.0, 1)
+        results[f"{fill_mode}_over_baseline_mb"] = round((peak - baseline) / 1024.0, 1)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+###
+# Checks, against benchmarks/fake_gimp.py, that recipe steps do not leak
+# context changes into each other: a Quick Black step sets the foreground to
+# black, and a following auto-outline step must still draw in the user's
+# foreground color. Exits non-zero if it does not.
+#
+#   python3 benchmarks/recipe_context.py
+
+import json
+import os
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+
+# The outline must be computed, not read from a previous run's cache
+os.environ["OWENJKLAN_OUTLINE_CACHE_MB"] = "0"
+
+import fake_gimp
+
+fake_gimp.install()
+
+RED = (1.0, 0.0, 0.0, 1.0)
+
+RECIPE = {
+    "steps": [
+        {"procedure": "owenjklan-quick-black-bottom"},
+        {"procedure": "owenjklan-auto-outline", "layers": ["Subject"],
+         "arguments": {"engine": "numpy", "color": "foreground"}},
+    ]
+}
+
+
+def subject_image(width=256, height=256):
+    # An opaque square in the middle of a transparent layer
+    image = fake_gimp.Image(width, height)
+    layer = fake_gimp.Layer(image, "Subject", width, height)
+    layer.pixels[height // 4:height * 3 // 4, width // 4:width * 3 // 4] = (200, 200, 200, 255)
+    image.insert_layer(layer, None, 0)
+    return image, layer
+
+
+def run_recipe(image, path):
+    procedure = fake_gimp.get_pdb().lookup_procedure("owenjklan-run-recipe")
+    config = procedure.create_config()
+    config.set_property("image", image)
+    config.set_property("drawables", image.selected_layers)
+    config.set_property("recipe", path)
+
+    results = procedure.run(config)
+    if results.index(0) != fake_gimp.PDBStatusType.SUCCESS:
+        raise RuntimeError(f"owenjklan-run-recipe returned {results.index(0).value_nick}")
+
+
+def main():
+    image, layer = subject_image()
+    fake_gimp.context_set_foreground(fake_gimp.Color(RED))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "context.json")
+        with open(path, "w") as f:
+            json.dump(RECIPE, f)
+        run_recipe(image, path)
+
+    # Just outside the square's top edge, where only the outline is
+    height, width = layer.pixels.shape[:2]
+    outline_pixel = layer.pixels[height // 4 - 1, width // 2].tolist()
+    foreground = fake_gimp.context_get_foreground().get_rgba()
+
+    ok = outline_pixel == [255, 0, 0, 255] and tuple(foreground) == RED
+    print(f"outline pixel {outline_pixel}, foreground after recipe {foreground}:"
+          f" {'ok' if ok else 'LEAKED CONTEXT'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
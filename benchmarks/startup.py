@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+###
+# Import-time and query-time benchmark for the owenjklan plug-ins.
+#
+# - Import time: a fresh Python interpreter per sample imports what a plug-in
+#   needs at query time (owenjklan_core.plugin and the procedure table). For
+#   comparison, the "eager" figure also imports every implementation module,
+#   which is what each plug-in used to pay at startup.
+# - Query time: with --gimp-console and --plugins-dir, runs gimp-console with
+#   the installed plug-in files touched (so GIMP re-queries them, as after a
+#   pluginrc invalidation) and again untouched.
+#
+# Each run appends one JSON record to --output, so startup cost can be tracked
+# over time:
+#
+#   python3 benchmarks/startup.py --samples 10 \
+#       --gimp-console gimp-console-3.0 \
+#       --plugins-dir ~/.config/GIMP/3.0/plug-ins
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(REPO_DIR, "scripts")
+
+PLUGINS = ["auto_outline", "quick_black", "centered_resize", "guide_groups", "recipes"]
+
+IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {scripts_dir!r})
+start = time.perf_counter()
+import owenjklan_core.plugin
+import owenjklan_core.procedures
+{extra}
+print(time.perf_counter() - start)
+"""
+
+
+def time_import(extra="", samples=5):
+    code = IMPORT_SNIPPET.format(scripts_dir=SCRIPTS_DIR, extra=extra)
+    timings = []
+    for _ in range(samples):
+        result = subprocess.run([sys.executable, "-c", code],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        timings.append(float(result.stdout.strip()) * 1000.0)
+    return timings
+
+
+def time_gimp_console(gimp_console, plugins_dir=None, samples=3):
+    timings = []
+    for _ in range(samples):
+        if plugins_dir is not None:
+            # A newer mtime than pluginrc makes GIMP query the plug-in again
+            for plugin in PLUGINS:
+                path = os.path.join(plugins_dir, plugin, plugin + ".py")
+                if os.path.exists(path):
+                    os.utime(path)
+
+        start = time.perf_counter()
+        subprocess.run([gimp_console, "-i", "--quit"],
+                       capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return timings
+
+
+def summarise(timings):
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "samples": len(timings),
+    }
+
+
+def git_revision():
+    result = subprocess.run(["git", "-C", REPO_DIR, "rev-parse", "--short", "HEAD"],
+                            capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time and query-time benchmark for the owenjklan plug-ins.")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--gimp-console", help="gimp-console executable, enables the query benchmark")
+    parser.add_argument("--plugins-dir", help="GIMP plug-ins directory the plug-ins are installed in")
+    parser.add_argument("--output", default=os.path.join(REPO_DIR, "benchmarks", "startup_results.jsonl"))
+    args = parser.parse_args()
+
+    eager_imports = "\n".join(f"import owenjklan_core.{plugin}" for plugin in PLUGINS)
+
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+    }
+
+    try:
+        record["import_lazy"] = summarise(time_import(samples=args.samples))
+        record["import_eager"] = summarise(time_import(eager_imports, samples=args.samples))
+    except RuntimeError as e:
+        print(f"Import benchmark failed: {e}")
+
+    if args.gimp_console:
+        if args.plugins_dir:
+            record["query_cold"] = summarise(time_gimp_console(args.gimp_console, args.plugins_dir, args.samples))
+        record["query_warm"] = summarise(time_gimp_console(args.gimp_console, samples=args.samples))
+
+    print(json.dumps(record, indent=2))
+    with open(args.output, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+###
+# Benchmark suite: every registered owenjklan procedure, headless under
+# gimp-console, on synthetic images from 1K to 16K.
+#
+# Each (procedure, size) sample is a fresh gimp-console process that builds
+# a synthetic image (--layers layers with an elliptical cut-out each, plus
+# --guides guides), then runs the procedure through the PDB. Wall time of
+# the procedure call is measured inside GIMP; peak RSS of the gimp-console
+# process, including its plug-in processes, comes from os.wait4().
+#
+#   python3 benchmarks/suite.py run --sizes 1K 4K 8K --layers 10 --guides 20 \
+#       --output bench-new.json
+#   python3 benchmarks/suite.py compare bench-old.json bench-new.json
+#
+# "compare" flags any procedure/size whose time or peak RSS grew by more
+# than --threshold (default 10%), and exits non-zero if there are any.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+
+from owenjklan_core.procedures import PROCEDURES
+
+SIZES = {
+    "1K": (1024, 576),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+    "16K": (15360, 8640),
+}
+
+# These need files set up beforehand, so are not part of the suite
+SKIPPED_PROCEDURES = {
+    "owenjklan-export-guide-template",
+    "owenjklan-import-guide-template",
+    "owenjklan-run-recipe",
+}
+
+RESULT_MARKER = "BENCHMARK-RESULT "
+
+BATCH_CODE = """
+import json, random, time
+import gi
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+
+width, height, layer_count, guide_count = {width}, {height}, {layers}, {guides}
+random.seed(0)
+
+image = Gimp.Image.new(width, height, Gimp.ImageBaseType.RGB)
+for i in range(layer_count):
+    layer = Gimp.Layer.new(image, f"Layer {{i}}", width, height,
+                           Gimp.ImageType.RGBA_IMAGE, 100.0, Gimp.LayerMode.NORMAL)
+    image.insert_layer(layer, None, 0)
+    ellipse_w = random.randint(width // 8, width // 2)
+    ellipse_h = random.randint(height // 8, height // 2)
+    image.select_ellipse(Gimp.ChannelOps.REPLACE,
+                         random.randint(0, width - ellipse_w), random.randint(0, height - ellipse_h),
+                         ellipse_w, ellipse_h)
+    layer.edit_fill(Gimp.FillType.FOREGROUND)
+Gimp.Selection.none(image)
+
+for i in range(guide_count):
+    if i % 2:
+        image.add_hguide(random.randint(0, height))
+    else:
+        image.add_vguide(random.randint(0, width))
+
+layers = image.get_layers()
+image.set_selected_layers(layers[:1])
+
+procedure = Gimp.get_pdb().lookup_procedure({procedure!r})
+config = procedure.create_config()
+config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+config.set_property("image", image)
+config.set_property("drawables", layers[:1])
+
+start = time.perf_counter()
+results = procedure.run(config)
+seconds = time.perf_counter() - start
+
+print({marker!r} + json.dumps({{"seconds": seconds, "status": results.index(0).value_nick}}), flush=True)
+"""
+
+
+def run_sample(gimp_console, procedure, width, height, layers, guides):
+    code = BATCH_CODE.format(width=width, height=height, layers=layers, guides=guides,
+                             procedure=procedure, marker=RESULT_MARKER)
+    process = subprocess.Popen([gimp_console, "-i", "--batch-interpreter=python-fu-eval",
+                                "-b", code, "--quit"],
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    output = process.stdout.read()
+    _, _, usage = os.wait4(process.pid, 0)
+
+    sample = {"peak_rss_mb": round(usage.ru_maxrss / 1024.0, 1)}
+    for line in output.splitlines():
+        if line.startswith(RESULT_MARKER):
+            sample.update(json.loads(line[len(RESULT_MARKER):]))
+            break
+    else:
+        sample["status"] = "no-result"
+    return sample
+
+
+def run_suite(args):
+    procedures = args.procedures or [name for name in PROCEDURES if name not in SKIPPED_PROCEDURES]
+
+    results = []
+    for size in args.sizes:
+        width, height = SIZES[size]
+        for procedure in procedures:
+            samples = [run_sample(args.gimp_console, procedure, width, height, args.layers, args.guides)
+                       for _ in range(args.repeat)]
+            timed = [sample["seconds"] for sample in samples if "seconds" in sample]
+
+            result = {
+                "procedure": procedure,
+                "size": size,
+                "width": width,
+                "height": height,
+                "layers": args.layers,
+                "guides": args.guides,
+                "status": samples[-1]["status"],
+                "seconds": round(statistics.median(timed), 4) if timed else None,
+                "peak_rss_mb": max(sample["peak_rss_mb"] for sample in samples),
+            }
+            print(f"{size:>4} {procedure:<45} {result['status']:<10}"
+                  f" {result['seconds']}s {result['peak_rss_mb']} MB")
+            results.append(result)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    return 0
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = {(r["procedure"], r["size"], r["layers"], r["guides"]): r for r in json.load(f)["results"]}
+    with open(args.current) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    for result in current:
+        key = (result["procedure"], result["size"], result["layers"], result["guides"])
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+
+        for metric in ("seconds", "peak_rss_mb"):
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            flag = "REGRESSION" if change > args.threshold else ""
+            if flag:
+                regressions += 1
+            if flag or args.verbose:
+                print(f"{result['size']:>4} {result['procedure']:<45} {metric:<12}"
+                      f" {old} -> {new} ({change:+.1%}) {flag}")
+
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the owenjklan procedures under gimp-console.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--gimp-console", default="gimp-console-3.0")
+    run_parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    run_parser.add_argument("--layers", type=int, default=1)
+    run_parser.add_argument("--guides", type=int, default=10)
+    run_parser.add_argument("--procedures", nargs="+", choices=sorted(PROCEDURES), metavar="NAME")
+    run_parser.add_argument("--repeat", type=int, default=1, help="Samples per procedure and size")
+    run_parser.add_argument("--output", default="benchmark-results.json")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions between two runs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.add_argument("--verbose", action="store_true", help="Show every comparison")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        return run_suite(args)
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+###
+# Measure the latency of a warm call to a one-shot plug-in procedure and to
+# the same procedure served by the resident extension host (owenjklan_host).
+#
+# Run inside GIMP's batch interpreter, with both owenjklan_host and the
+# plug-in being measured installed:
+#
+#   gimp-console-3.0 -i --batch-interpreter=python-fu-eval \
+#       -b "exec(open('benchmarks/warm_call_latency.py').read())" --quit
+#
+# Environment variables:
+#   BENCH_PROCEDURE  - procedure to call (default: owenjklan-list-guides)
+#   BENCH_CALLS      - number of timed calls per variant (default: 20)
+
+import os
+import statistics
+import time
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+
+procedure_name = os.environ.get("BENCH_PROCEDURE", "owenjklan-list-guides")
+calls = int(os.environ.get("BENCH_CALLS", "20"))
+
+pdb = Gimp.get_pdb()
+image = Gimp.Image.new(1920, 1080, Gimp.ImageBaseType.RGB)
+layer = Gimp.Layer.new(image, "Background", 1920, 1080,
+                       Gimp.ImageType.RGBA_IMAGE, 100.0, Gimp.LayerMode.NORMAL)
+image.insert_layer(layer, None, 0)
+image.set_selected_layers([layer])
+
+
+def time_calls(name):
+    procedure = pdb.lookup_procedure(name)
+    if procedure is None:
+        return None
+
+    config = procedure.create_config()
+    config.set_property("run-mode", Gimp.RunMode.NONINTERACTIVE)
+    config.set_property("image", image)
+    config.set_property("drawables", [layer])
+
+    # The first call is not timed, it pays for any one-off loading.
+    procedure.run(config)
+
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        procedure.run(config)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return timings
+
+
+resident = procedure_name.replace("owenjklan-", "owenjklan-resident-", 1)
+for label, name in (("one-shot", procedure_name), ("resident", resident)):
+    timings = time_calls(name)
+    if timings is None:
+        print(f"{label:>9}: {name} is not registered")
+        continue
+    print(f"{label:>9}: {name} median {statistics.median(timings):.1f} ms,"
+          f" min {min(timings):.1f} ms over {calls} calls")
+
+image.delete()
@@ -0,0 +1,10 @@
+###
+# Shared core for the owenjklan GIMP 3.0 plug-ins.
+#
+# The plug-in directories under scripts/ only contain a thin Gimp.PlugIn
+# subclass. Procedure metadata lives in owenjklan_core.procedures (plain data,
+# no gi imports) and the code for each procedure lives in a module named after
+# its plug-in, imported only when one of its procedures first runs.
+#
+# This directory has no owenjklan_core.py, so GIMP does not try to run it as
+# a plug-in. Install it next to the plug-in directories.
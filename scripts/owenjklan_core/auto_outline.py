@@ -0,0 +1,241 @@
+###
+# Auto-outline:
+#
+# - Use the "Alpha to selection" on a layer
+# - Grow the selection by 3 pixels
+# - Apply the "Stroke selection" for 6 pixels
+#
+# This is to make outlining layers in thumbnails etc. far easier
+# ie: Able to be bound to a shortcut / Stream Deck button.
+#
+# The "numpy" engine skips the selection grow and brush stroke: it reads the
+# layer once, dilates its alpha channel (owenjklan_core.outline) and writes
+# the ring back in a single buffer set. It needs NumPy in GIMP's Python.
+#
+# All selected layers are outlined in one undo group. The numpy engine only
+# reads and writes each layer's content bounding box plus the line width.
+#
+# With color "auto" each layer is outlined in black or white, whichever
+# contrasts with more of its content: a luminance histogram of a strided
+# sample (owenjklan_core.outline), taken from the pixels the numpy engine
+# already read, or from one reduced-scale buffer fetch for the stroke engine.
+#
+# Results are cached on disk by content hash (owenjklan_core.outline_cache),
+# so outlining the same content again with the same width and color only
+# composites the stored ring. The numpy engine stores its dilated alpha. The
+# stroke engine, when outlining several layers, selects each layer's own
+# alpha and sets every stroke setting itself, so its result only depends on
+# the layer: it stores the coverage of the stroke
+# (owenjklan_core.outline.paint_coverage) and a hit paints that instead of
+# growing and stroking a selection. Rings the canvas edge would clip are not
+# cached. A single layer is stroked around the user's current selection,
+# which the cache cannot know, so single-layer stroke runs are never cached.
+
+import os
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+gi.require_version('Gegl', '0.4')
+from gi.repository import Gegl
+
+from owenjklan_core.plugin import ProcedureError, procedure_runner
+
+
+def outline_with_stroke(image, layer, line_width):
+    # As of 22nd Dec. 2024, it appears that Gimp.Unit.pixel() is broken.
+    # So, we determine the pixels to points then set the line width unit
+    # to points
+
+    # We need to obtain the image DPI for the pixels-to-points conversion
+    _, x_resolution, y_resolution = image.get_resolution()
+    line_width_in_points = Gimp.pixels_to_units(line_width, Gimp.Unit.point(), x_resolution)
+
+    # Grow the selection by half the width of the stroke
+    image_selection = image.get_selection()
+    image_selection.grow(image, line_width / 2)
+
+    # Paint a stroke along the selection
+    Gimp.context_set_line_width_unit(Gimp.Unit.point())
+    Gimp.context_set_line_width(
+        line_width_in_points,
+    )
+    Gimp.context_set_antialias(True)
+    Gimp.context_set_brush_hardness(1.0)
+    Gimp.context_set_stroke_method(Gimp.StrokeMethod.LINE)
+
+    # Everything else the line stroke reads from the context, at GIMP's
+    # defaults, so the outline (and what the outline cache stores for it)
+    # does not depend on the user's stroke settings
+    Gimp.context_set_line_join_style(Gimp.JoinStyle.MITER)
+    Gimp.context_set_line_cap_style(Gimp.CapStyle.BUTT)
+    Gimp.context_set_line_miter_limit(10.0)
+    Gimp.context_set_line_dash_offset(0.0)
+    Gimp.context_set_line_dash_pattern([])
+    Gimp.context_set_opacity(100.0)
+    Gimp.context_set_paint_mode(Gimp.LayerMode.NORMAL)
+
+    # Actually perform the stroke
+    layer.edit_stroke_selection()
+
+
+def contrasting_foreground(layer):
+    # Set the foreground (which the stroke engine paints with) to black or
+    # white, whichever contrasts with the layer. procedure_runner's context
+    # push keeps this from outliving the procedure.
+    from owenjklan_core import outline, pixels
+
+    luma = outline.contrasting_luma(outline.luma_histogram(pixels.sample_pixels(layer)))
+    Gimp.context_set_foreground(Gegl.Color.new("white" if luma else "black"))
+
+
+def outline_cache_dir():
+    return os.path.join(Gimp.directory(), "outline-cache")
+
+
+def outline_with_numpy(image, layer, line_width, auto_color=False):
+    import numpy as np
+    from owenjklan_core import outline, outline_cache, pixels
+
+    bounds = pixels.content_bounds(layer)
+    if bounds is None:
+        return
+
+    # The stroke engine's ring runs from the content edge out to the full
+    # line width (a grow of half the width, stroked at full width), plus one
+    # pixel of antialiasing.
+    x, y, width, height = pixels.grow_bounds(bounds, line_width + 1,
+                                             layer.get_width(), layer.get_height())
+
+    layer_pixels = pixels.read_pixels(layer, x, y, width, height, writable=True)
+    colour = None
+    if not auto_color:
+        colour = pixels.color_to_pixel(Gimp.context_get_foreground(), layer_pixels.dtype)
+
+    cache = outline_cache.OutlineCache(outline_cache_dir())
+    key = outline_cache.cache_key(layer_pixels, line_width, "numpy", colour) if cache.enabled() else None
+    cached = cache.get(key) if key else None
+
+    if cached is not None:
+        outline_alpha, colour = cached
+    else:
+        if auto_color:
+            step = pixels.sample_step(width, height)
+            luma = outline.contrasting_luma(outline.luma_histogram(layer_pixels[::step, ::step]))
+            colour = [luma if layer_pixels.dtype == np.uint8 else luma / 255.0] * 3
+
+        outline_alpha = outline.dilate_alpha(layer_pixels[..., 3], line_width)
+        if key:
+            cache.put(key, outline_alpha, colour)
+
+    if outline.composite_outline(layer_pixels, outline_alpha, colour):
+        pixels.write_pixels(layer, layer_pixels, x, y)
+
+
+def stroke_layer_alpha(image, layer, line_width, auto_color=False):
+    if auto_color:
+        contrasting_foreground(layer)
+    image.select_item(Gimp.ChannelOps.REPLACE, layer)
+    outline_with_stroke(image, layer, line_width)
+
+
+def outline_with_cached_stroke(image, layer, line_width, auto_color=False):
+    # stroke_layer_alpha() through the outline cache. Without NumPy, or with
+    # the cache disabled, it just strokes.
+    try:
+        from owenjklan_core import outline, outline_cache, pixels
+    except ImportError:
+        stroke_layer_alpha(image, layer, line_width, auto_color)
+        return
+
+    cache = outline_cache.OutlineCache(outline_cache_dir())
+    bounds = pixels.content_bounds(layer) if cache.enabled() else None
+    if bounds is None:
+        stroke_layer_alpha(image, layer, line_width, auto_color)
+        return
+
+    # The same region as the numpy engine, the stroke reaches as far
+    x, y, width, height = pixels.grow_bounds(bounds, line_width + 1,
+                                             layer.get_width(), layer.get_height())
+
+    # The selection, and so the stroke, is clipped to the canvas, which the
+    # region's pixels say nothing about. Only cache rings that are whole.
+    _, offset_x, offset_y = layer.get_offsets()
+    if (x + offset_x < 0 or y + offset_y < 0
+            or x + offset_x + width > image.get_width() or y + offset_y + height > image.get_height()):
+        stroke_layer_alpha(image, layer, line_width, auto_color)
+        return
+
+    before = pixels.read_pixels(layer, x, y, width, height)
+    colour = None
+    if not auto_color:
+        colour = pixels.color_to_pixel(Gimp.context_get_foreground(), before.dtype)
+
+    key = outline_cache.cache_key(before, line_width, "stroke", colour)
+    cached = cache.get(key)
+    if cached is not None:
+        coverage, colour = cached
+        layer_pixels = before.copy()
+        if outline.paint_over(layer_pixels, coverage, colour):
+            pixels.write_pixels(layer, layer_pixels, x, y)
+        return
+
+    stroke_layer_alpha(image, layer, line_width, auto_color)
+    if colour is None:
+        colour = pixels.color_to_pixel(Gimp.context_get_foreground(), before.dtype)
+    after = pixels.read_pixels(layer, x, y, width, height)
+    cache.put(key, outline.paint_coverage(before, after, colour), colour)
+
+
+def outline_layers(image, layers, line_width, engine, auto_color=False):
+    # A single layer keeps the original behaviour of stroking the current
+    # selection. With several layers each one is stroked around its own
+    # alpha, and the user's selection is restored afterwards.
+    if engine != "numpy" and len(layers) == 1:
+        if auto_color:
+            contrasting_foreground(layers[0])
+        outline_with_stroke(image, layers[0], line_width)
+        return
+
+    saved_selection = None
+    if not Gimp.Selection.is_empty(image):
+        saved_selection = Gimp.Selection.save(image)
+        Gimp.Selection.none(image)
+
+    try:
+        for layer in layers:
+            if engine == "numpy":
+                outline_with_numpy(image, layer, line_width, auto_color)
+            else:
+                outline_with_cached_stroke(image, layer, line_width, auto_color)
+    finally:
+        if engine != "numpy":
+            Gimp.Selection.none(image)
+        if saved_selection is not None:
+            image.select_item(Gimp.ChannelOps.REPLACE, saved_selection)
+            image.remove_channel(saved_selection)
+
+
+def auto_outline(image, drawables, config):
+    # Layer groups have no pixels of their own to outline
+    selected_layers = [layer for layer in image.get_selected_layers()
+                       if not layer.is_group() and layer.has_alpha()]
+
+    if not selected_layers:
+        return "Auto-outline needs at least one selected layer with an alpha channel."
+
+    engine = config.get_property("engine")
+    line_width = config.get_property("line-width")
+    auto_color = config.get_property("color") == "auto"
+
+    try:
+        outline_layers(image, selected_layers, line_width, engine, auto_color)
+    except ImportError:
+        raise ProcedureError("Auto-outline 'numpy' engine and 'auto' color require NumPy in GIMP's Python.")
+
+    return (f"Applied automatic outline of {line_width} pixels to {len(selected_layers)}"
+            f" layer(s) ({engine} engine).")
+
+
+owenjklan_auto_outline = procedure_runner(auto_outline)
@@ -0,0 +1,230 @@
+###
+# Headless batch runner, executed inside gimp-console.
+#
+# Streams a list of files through one owenjklan procedure: load one image,
+# disable its undo, run the procedure's code in this process (no plug-in
+# launch per file), export, delete the image, then move on to the next. At
+# most one input image is alive at a time, so peak memory does not grow with
+# the number of files.
+#
+# With the "async" export mode, encoding and writing the output is taken off
+# GIMP's critical path: each processed image is flattened, read into a NumPy
+# array and deleted, and the array is handed to a pool of writer threads
+# that encode it with Pillow (which releases the GIL while compressing)
+# while the next file is processed. The handoff queue holds at most
+# 'queue_depth' images, so memory stays bounded if the writers fall behind.
+# Output is 8 bits per channel; formats Pillow cannot write are exported by
+# GIMP as in the default "sync" mode. Needs NumPy and Pillow in GIMP's Python.
+#
+# Jobs are JSON files written by owenjklan_core.batch_driver, which is also
+# what starts gimp-console:
+#
+#   {
+#     "procedure": "owenjklan-image-canvas-centered-resize",
+#     "arguments": {"scale": 1.5},
+#     "inputs": ["in/a.png", "in/b.png"],
+#     "output_dir": "out",
+#     "output_extension": ".webp",
+#     "export": {"mode": "async", "writers": 2, "queue_depth": 4},
+#     "report": "out/report.json"
+#   }
+
+import json
+import os
+import queue
+import resource
+import threading
+import time
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+from gi.repository import Gio
+
+from owenjklan_core.plugin import run_procedure
+
+
+def output_path(input_path, output_dir, output_extension=None):
+    base, extension = os.path.splitext(os.path.basename(input_path))
+    return os.path.join(output_dir, base + (output_extension or extension))
+
+
+# Extension -> (Pillow format, whether it keeps alpha), for async export
+PILLOW_FORMATS = {
+    ".png": ("PNG", True),
+    ".webp": ("WEBP", True),
+    ".tif": ("TIFF", True),
+    ".tiff": ("TIFF", True),
+    ".jpg": ("JPEG", False),
+    ".jpeg": ("JPEG", False),
+}
+
+
+def load_and_run(name, procedure, config, input_path):
+    image = Gimp.file_load(Gimp.RunMode.NONINTERACTIVE, Gio.File.new_for_path(input_path))
+    try:
+        # Nothing is ever undone in a batch, don't pay for undo copies
+        image.undo_disable()
+
+        return_values = run_procedure(procedure, Gimp.RunMode.NONINTERACTIVE, image,
+                                      image.get_selected_layers(), config, name)
+        status = return_values.index(0)
+        if status != Gimp.PDBStatusType.SUCCESS:
+            raise RuntimeError(f"{name} returned {status.value_nick}")
+    except Exception:
+        image.delete()
+        raise
+    return image
+
+
+def process_file(name, procedure, config, input_path, export_path):
+    image = load_and_run(name, procedure, config, input_path)
+    try:
+        if not Gimp.file_save(Gimp.RunMode.NONINTERACTIVE, image,
+                              Gio.File.new_for_path(export_path), None):
+            raise RuntimeError(f"Export to {export_path} failed")
+    finally:
+        image.delete()
+
+
+def render_file(name, procedure, config, input_path, keep_alpha):
+    # Process 'input_path' and return the composited result as an 8-bit
+    # RGBA (or RGB) array. The image is deleted before returning.
+    from owenjklan_core import pixels
+
+    image = load_and_run(name, procedure, config, input_path)
+    try:
+        if keep_alpha:
+            layer = image.merge_visible_layers(Gimp.MergeType.CLIP_TO_IMAGE)
+            layer.resize_to_image_size()
+        else:
+            # Composited over the background color, like GIMP's own export
+            layer = image.flatten()
+
+        # GEGL converts to 8-bit (and drops alpha) while reading
+        return pixels.read_pixels(layer, 0, 0, layer.get_width(), layer.get_height(),
+                                  "R'G'B'A u8" if keep_alpha else "R'G'B' u8")
+    finally:
+        image.delete()
+
+
+class AsyncExporter:
+    # Writer threads encoding arrays to files. submit() blocks while
+    # 'queue_depth' arrays are already waiting.
+    def __init__(self, writers, queue_depth):
+        # Imported here so a missing Pillow fails the job up front rather
+        # than in the writers
+        try:
+            from PIL import Image
+        except ImportError:
+            raise RuntimeError("Async export needs Pillow in GIMP's Python")
+        self.image_type = Image
+
+        self.queue = queue.Queue(maxsize=max(1, queue_depth))
+        self.threads = [threading.Thread(target=self.work, daemon=True) for _ in range(max(1, writers))]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, result, array, export_path, pillow_format):
+        self.queue.put((result, array, export_path, pillow_format))
+
+    def work(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+
+            result, array, export_path, pillow_format = item
+            start = time.perf_counter()
+            try:
+                self.image_type.fromarray(array, "RGBA" if array.shape[2] == 4 else "RGB").save(
+                    export_path, pillow_format)
+                result["status"] = "success"
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = f"Export to {export_path} failed: {e}"
+            result["export_seconds"] = round(time.perf_counter() - start, 4)
+
+    def close(self):
+        # Wait for everything submitted to be written
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
+
+def run_batch(name, inputs, output_dir, arguments=None, output_extension=None, export=None):
+    # Returns one result record per input. 'export' is the job's export
+    # settings, see the top of this file.
+    procedure = Gimp.get_pdb().lookup_procedure(name)
+    if procedure is None:
+        raise RuntimeError(f"Procedure '{name}' is not registered, are the plug-ins installed?")
+
+    config = procedure.create_config()
+    for argument_name, value in (arguments or {}).items():
+        config.set_property(argument_name, value)
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    export = export or {}
+    exporter = None
+    if export.get("mode") == "async":
+        exporter = AsyncExporter(export.get("writers", 2), export.get("queue_depth", 4))
+
+    results = []
+    try:
+        for input_path in inputs:
+            export_path = output_path(input_path, output_dir, output_extension)
+            result = {"input": input_path, "output": export_path}
+            pillow_format = PILLOW_FORMATS.get(os.path.splitext(export_path)[1].lower())
+
+            start = time.perf_counter()
+            try:
+                if exporter is not None and pillow_format is not None:
+                    array = render_file(name, procedure, config, input_path, pillow_format[1])
+                    result["status"] = "queued"
+                    exporter.submit(result, array, export_path, pillow_format[0])
+                else:
+                    process_file(name, procedure, config, input_path, export_path)
+                    result["status"] = "success"
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = str(e)
+            result["seconds"] = round(time.perf_counter() - start, 4)
+
+            print(f"{result['status']:>7}: {input_path} ({result['seconds']}s)")
+            results.append(result)
+    finally:
+        if exporter is not None:
+            exporter.close()
+
+    return results
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1)
+
+
+def run_job_file(job_path):
+    with open(job_path) as f:
+        job = json.load(f)
+
+    start = time.perf_counter()
+    results = run_batch(job["procedure"], job["inputs"], job["output_dir"],
+                        job.get("arguments"), job.get("output_extension"), job.get("export"))
+    wall_seconds = time.perf_counter() - start
+
+    summary = {
+        "export_mode": job.get("export", {}).get("mode", "sync"),
+        "wall_seconds": round(wall_seconds, 3),
+        "files_per_second": round(len(results) / wall_seconds, 3) if wall_seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    if job.get("report"):
+        with open(job["report"], "w") as f:
+            json.dump({"procedure": job["procedure"], "summary": summary, "results": results}, f, indent=2)
+
+    return results
@@ -0,0 +1,286 @@
+###
+# Command line driver for headless batch runs. Runs outside GIMP (no gi
+# imports): it collects the input files, writes a job file and starts
+# gimp-console to execute it with owenjklan_core.batch.
+#
+#   python3 -m owenjklan_core.batch_driver \
+#       --procedure owenjklan-image-canvas-centered-resize \
+#       --set scale=1.5 --output-dir out/ --extension .png thumbnails/
+#
+# The PDB is single threaded within a GIMP instance, so the input list is
+# sharded across --workers gimp-console processes (default: CPU count). A
+# shared work queue hands out chunks of --chunk-size files; each worker slot
+# runs one gimp-console per chunk. Failed files are queued again, up to
+# --retries times, and all per-file results and timings are merged into
+# one report.
+#
+# --export-mode async hands encoding and writing to --writers threads in each
+# gimp-console, with at most --queue-depth processed images waiting (see
+# owenjklan_core.batch). The report's summary has the throughput and the
+# largest peak RSS of any chunk, to compare it with the default sync mode.
+#
+# Run it from the scripts/ directory, or with scripts/ on PYTHONPATH.
+
+import argparse
+import json
+import math
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from owenjklan_core.procedures import PROCEDURES
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMAGE_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".webp", ".tif", ".tiff", ".xcf", ".bmp", ".gif", ".psd", ".avif",
+}
+
+BATCH_CODE = (
+    "import sys; sys.path.insert(0, {scripts_dir!r}); "
+    "from owenjklan_core.batch import run_job_file; "
+    "run_job_file({job_path!r})"
+)
+
+
+def collect_inputs(paths):
+    # Files are taken as given, directories contribute their image files
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for entry in sorted(os.listdir(path)):
+                if os.path.splitext(entry)[1].lower() in IMAGE_EXTENSIONS:
+                    inputs.append(os.path.join(path, entry))
+        else:
+            inputs.append(path)
+    return [os.path.abspath(path) for path in inputs]
+
+
+def parse_arguments(name, assignments):
+    # "name=value" strings -> {name: value}, typed from the procedure table
+    declared = {argument["name"]: argument for argument in PROCEDURES[name].get("arguments", [])}
+
+    arguments = {}
+    for assignment in assignments:
+        argument_name, _, text = assignment.partition("=")
+        argument = declared.get(argument_name)
+        if argument is None:
+            raise ValueError(f"{name} has no argument '{argument_name}'")
+
+        kind = argument["type"]
+        if kind == "int":
+            value = int(text)
+        elif kind == "double":
+            value = float(text)
+        elif kind == "boolean":
+            value = text.lower() in ("1", "true", "yes", "on")
+        elif kind == "choice":
+            nicks = [nick for nick, _ in argument["choices"]]
+            if text not in nicks:
+                raise ValueError(f"'{argument_name}' must be one of {', '.join(nicks)}")
+            value = text
+        else:
+            value = text
+        arguments[argument_name] = value
+
+    return arguments
+
+
+def gimp_console_command(gimp_console, job_path):
+    code = BATCH_CODE.format(scripts_dir=SCRIPTS_DIR, job_path=job_path)
+    return [gimp_console, "-i", "--batch-interpreter=python-fu-eval", "-b", code, "--quit"]
+
+
+def write_job(job, directory=None):
+    fd, job_path = tempfile.mkstemp(prefix="owenjklan-job-", suffix=".json", dir=directory)
+    with os.fdopen(fd, "w") as f:
+        json.dump(job, f)
+    return job_path
+
+
+def run_job(job, gimp_console="gimp-console-3.0"):
+    # Run 'job' in one gimp-console process. Returns the process exit code.
+    job_path = write_job(job)
+    try:
+        return subprocess.run(gimp_console_command(gimp_console, job_path)).returncode
+    finally:
+        os.remove(job_path)
+
+
+def run_chunk(job, inputs, gimp_console):
+    # Run 'inputs' as one gimp-console job, returning a result per input and
+    # the job's summary. Inputs missing from the report (eg. gimp-console
+    # crashed) are failed.
+    fd, report_path = tempfile.mkstemp(prefix="owenjklan-report-", suffix=".json")
+    os.close(fd)
+
+    chunk_job = dict(job, inputs=inputs, report=report_path)
+    try:
+        returncode = run_job(chunk_job, gimp_console)
+        try:
+            with open(report_path) as f:
+                report = json.load(f)
+            results, summary = report["results"], report.get("summary", {})
+        except (OSError, ValueError, KeyError):
+            results, summary = [], {}
+    finally:
+        os.remove(report_path)
+
+    reported = {result["input"] for result in results}
+    for input_path in inputs:
+        if input_path not in reported:
+            results.append({"input": input_path, "status": "failed",
+                            "error": f"gimp-console exited with code {returncode} before reporting"})
+    return results, summary
+
+
+def run_pool(job, workers, chunk_size=None, retries=1, gimp_console="gimp-console-3.0"):
+    # Shard job["inputs"] over 'workers' concurrent gimp-console processes.
+    # Returns the merged report.
+    inputs = job["inputs"]
+    if chunk_size is None:
+        # A few chunks per worker keeps the workers evenly loaded without
+        # paying gimp-console startup for every file
+        chunk_size = max(1, math.ceil(len(inputs) / (workers * 4)))
+
+    work = queue.Queue()
+    for start in range(0, len(inputs), chunk_size):
+        work.put((inputs[start:start + chunk_size], 0))
+
+    results = {}
+    peak_rss = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            item = work.get()
+            if item is None:
+                work.task_done()
+                return
+
+            chunk, attempt = item
+            try:
+                try:
+                    chunk_results, chunk_summary = run_chunk(job, chunk, gimp_console)
+                except Exception as e:
+                    # eg. gimp-console not found. Every input of the chunk
+                    # fails, the worker carries on.
+                    chunk_results = [{"input": input_path, "status": "failed", "error": str(e)}
+                                     for input_path in chunk]
+                    chunk_summary = {}
+
+                if "peak_rss_mb" in chunk_summary:
+                    with lock:
+                        peak_rss.append(chunk_summary["peak_rss_mb"])
+                failed = []
+                for result in chunk_results:
+                    result["attempts"] = attempt + 1
+                    if result["status"] != "success" and attempt < retries:
+                        failed.append(result["input"])
+                    with lock:
+                        results[result["input"]] = result
+
+                if failed:
+                    work.put((failed, attempt + 1))
+            finally:
+                # A worker that dies without this leaves work.join() waiting
+                work.task_done()
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    # Retries are queued before task_done(), so join() only returns once
+    # everything, including retries, has been processed
+    work.join()
+    for _ in threads:
+        work.put(None)
+    for thread in threads:
+        thread.join()
+    wall_seconds = time.perf_counter() - start_time
+
+    ordered = [results[input_path] for input_path in inputs]
+    succeeded = [result for result in ordered if result["status"] == "success"]
+    busy_seconds = sum(result.get("seconds", 0.0) for result in ordered)
+
+    return {
+        "procedure": job["procedure"],
+        "summary": {
+            "files": len(ordered),
+            "succeeded": len(succeeded),
+            "failed": len(ordered) - len(succeeded),
+            "workers": workers,
+            "chunk_size": chunk_size,
+            "export_mode": job.get("export", {}).get("mode", "sync"),
+            "wall_seconds": round(wall_seconds, 3),
+            "processing_seconds": round(busy_seconds, 3),
+            "files_per_second": round(len(ordered) / wall_seconds, 3) if wall_seconds else None,
+            "peak_rss_mb": max(peak_rss, default=None),
+        },
+        "results": ordered,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run an owenjklan procedure over many files with gimp-console.")
+    parser.add_argument("inputs", nargs="+", help="Image files and/or directories of images")
+    parser.add_argument("--procedure", required=True, choices=sorted(PROCEDURES), metavar="NAME")
+    parser.add_argument("--set", dest="assignments", action="append", default=[], metavar="NAME=VALUE",
+                        help="Procedure argument, may be repeated")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--extension", help="Export with this extension (and format) instead of the input's")
+    parser.add_argument("--report", help="Write per-file results to this JSON file")
+    parser.add_argument("--gimp-console", default="gimp-console-3.0")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of gimp-console processes to run at once (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, help="Files per gimp-console launch")
+    parser.add_argument("--retries", type=int, default=1, help="Times a failed file is retried")
+    parser.add_argument("--export-mode", choices=["sync", "async"], default="sync",
+                        help="Export from GIMP, or encode in writer threads while the next file is processed")
+    parser.add_argument("--writers", type=int, default=2, help="Writer threads per gimp-console (async)")
+    parser.add_argument("--queue-depth", type=int, default=4,
+                        help="Processed images that may wait for a writer (async)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("No input images found.")
+        return 1
+
+    job = {
+        "procedure": args.procedure,
+        "arguments": parse_arguments(args.procedure, args.assignments),
+        "inputs": inputs,
+        "output_dir": os.path.abspath(args.output_dir),
+        "output_extension": args.extension,
+        "export": {"mode": args.export_mode, "writers": args.writers, "queue_depth": args.queue_depth},
+    }
+
+    report = run_pool(job, max(1, args.workers), args.chunk_size, args.retries, args.gimp_console)
+
+    summary = report["summary"]
+    print(f"{summary['succeeded']}/{summary['files']} files succeeded in {summary['wall_seconds']}s"
+          f" with {summary['workers']} workers ({summary['files_per_second']} files/s,"
+          f" {summary['export_mode']} export, peak RSS {summary['peak_rss_mb']} MB)")
+    for result in report["results"]:
+        if result["status"] != "success":
+            print(f"  failed: {result['input']}: {result.get('error')}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+###
+# Guide groups: add and remove groups of guides at fixed percentages of the
+# image size (edges, halves, thirds and quarters), a parametric grid of
+# N divisions, golden-ratio splits and margin insets, and JSON guide
+# templates (see owenjklan_core.templates).
+
+import os
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+from gi.repository import GLib
+
+from owenjklan_core import templates
+from owenjklan_core.guides import DEFAULT_TOLERANCE, GuideIndex
+from owenjklan_core.plugin import ProcedureError, procedure_runner, set_int32_array_return_value
+
+GOLDEN_RATIO = (1.0 + 5.0 ** 0.5) / 2.0
+
+
+def percentage_position(length, percent):
+    # Whole pixel position of 'percent' of 'length'. Adding and removing
+    # both go through this, so removal targets are exactly where the
+    # guides were added.
+    return round(length * (percent / 100.0))
+
+
+def add_guides_at_percentages(image, positions):
+    # Positions that already have a guide are skipped, so repeated calls do
+    # not pile up duplicate guides.
+    image_width = image.get_width()
+    image_height = image.get_height()
+    index = GuideIndex(image)
+
+    added = 0
+    for percent_pos in positions:
+        h_guide = percentage_position(image_height, percent_pos)
+        v_guide = percentage_position(image_width, percent_pos)
+
+        added += index.add(Gimp.OrientationType.HORIZONTAL, h_guide)
+        added += index.add(Gimp.OrientationType.VERTICAL, v_guide)
+    return added
+
+
+def owenjklan_list_guides(procedure, run_mode, image, drawables, config, run_data):
+    index = GuideIndex(image)
+
+    print("Existing Guide dump")
+    print("Vertical Guides:")
+    for guide_id, position in index.guides(Gimp.OrientationType.VERTICAL):
+        print(f"ID: {guide_id:>2} @ {position:>4}px")
+
+    print("Horizontal Guides:")
+    for guide_id, position in index.guides(Gimp.OrientationType.HORIZONTAL):
+        print(f"ID: {guide_id:>2} @ {position:>4}px")
+
+    for guide_id in index.unknown_ids:
+        print(f"Guide with UNKNOWN Orientation (id: {guide_id})")
+
+    print()
+
+    return_values = procedure.new_return_values(Gimp.PDBStatusType.SUCCESS, GLib.Error())
+    set_int32_array_return_value(return_values, 1, index.positions[Gimp.OrientationType.HORIZONTAL])
+    set_int32_array_return_value(return_values, 2, index.positions[Gimp.OrientationType.VERTICAL])
+    return return_values
+
+
+def remove_guides_at_percentages(image, positions, tolerance=DEFAULT_TOLERANCE):
+    image_width = image.get_width()
+    image_height = image.get_height()
+    pixel_h_positions = [percentage_position(image_height, pos) for pos in positions]
+    pixel_w_positions = [percentage_position(image_width, pos) for pos in positions]
+
+    index = GuideIndex(image)
+    matched = (index.match(Gimp.OrientationType.HORIZONTAL, pixel_h_positions, tolerance)
+               + index.match(Gimp.OrientationType.VERTICAL, pixel_w_positions, tolerance))
+    return index.delete(matched)
+
+
+# Guide group name -> (percentages, description used in messages)
+GUIDE_GROUPS = {
+    "edges": ([0, 100], "around edges"),
+    "halves": ([50], "at halves"),
+    "thirds": ([33, 66], "at thirds"),
+    "quarters": ([25, 50, 75], "at quarters"),
+}
+
+
+def add_guide_group_procedure(group):
+    positions, description = GUIDE_GROUPS[group]
+
+    def add_guide_group(image, drawables, config):
+        added = add_guides_at_percentages(image, positions)
+        return f"Added {added} guides {description}"
+
+    return procedure_runner(add_guide_group)
+
+
+def remove_guide_group_procedure(group):
+    positions, description = GUIDE_GROUPS[group]
+
+    def remove_guide_group(image, drawables, config):
+        removed = remove_guides_at_percentages(image, positions, config.get_property("tolerance"))
+        return f"Removed {removed} guides {description}"
+
+    return procedure_runner(remove_guide_group)
+
+
+owenjklan_add_guide_groups_edges = add_guide_group_procedure("edges")
+owenjklan_remove_guide_groups_edges = remove_guide_group_procedure("edges")
+owenjklan_add_guide_groups_halves = add_guide_group_procedure("halves")
+owenjklan_remove_guide_groups_halves = remove_guide_group_procedure("halves")
+owenjklan_add_guide_groups_thirds = add_guide_group_procedure("thirds")
+owenjklan_remove_guide_groups_thirds = remove_guide_group_procedure("thirds")
+owenjklan_add_guide_groups_quarters = add_guide_group_procedure("quarters")
+owenjklan_remove_guide_groups_quarters = remove_guide_group_procedure("quarters")
+
+
+def grid_positions(length, divisions=1, golden_ratio=False, margin=0):
+    # Pixel positions along one axis of 'length' pixels: the margin insets,
+    # then 'divisions' equal parts and/or golden-ratio splits of the area
+    # inside the margins.
+    start = margin
+    end = length - margin
+    if end <= start:
+        return []
+
+    fractions = [i / divisions for i in range(1, divisions)]
+    if golden_ratio:
+        fractions += [1.0 - 1.0 / GOLDEN_RATIO, 1.0 / GOLDEN_RATIO]
+
+    positions = {start + round((end - start) * fraction) for fraction in fractions}
+    if margin > 0:
+        positions.update((start, end))
+
+    return sorted(positions)
+
+
+def add_guides(image, h_positions, v_positions):
+    # Add guides at pixel positions, skipping those that already exist
+    index = GuideIndex(image)
+
+    added = 0
+    for position in h_positions:
+        added += index.add(Gimp.OrientationType.HORIZONTAL, position)
+    for position in v_positions:
+        added += index.add(Gimp.OrientationType.VERTICAL, position)
+    return added
+
+
+def add_guide_grid(image, divisions=1, golden_ratio=False, margin=0):
+    h_positions = grid_positions(image.get_height(), divisions, golden_ratio, margin)
+    v_positions = grid_positions(image.get_width(), divisions, golden_ratio, margin)
+    return add_guides(image, h_positions, v_positions)
+
+
+def target_images(image, config):
+    if config.get_property("all-images"):
+        return Gimp.get_images()
+    return [image]
+
+
+def guide_grid(image, drawables, config):
+    divisions = config.get_property("divisions")
+    golden_ratio = config.get_property("golden-ratio")
+    margin = config.get_property("margin")
+
+    images = target_images(image, config)
+    added = 0
+    for target in images:
+        target.undo_group_start()
+        try:
+            added += add_guide_grid(target, divisions, golden_ratio, margin)
+        finally:
+            target.undo_group_end()
+
+    return f"Added {added} guides to {len(images)} image(s)"
+
+
+owenjklan_add_guide_grid = procedure_runner(guide_grid)
+
+
+def template_library_dir():
+    return os.path.join(Gimp.directory(), "guide-templates")
+
+
+def export_guide_template(image, drawables, config):
+    path = templates.resolve_template_path(config.get_property("template"), template_library_dir())
+    if os.path.exists(path) and not config.get_property("overwrite"):
+        raise ProcedureError(f"Guide template {path} already exists, choose another name or 'Overwrite'.")
+    index = GuideIndex(image)
+
+    template = templates.make_template(image.get_width(), image.get_height(),
+                                       index.positions[Gimp.OrientationType.HORIZONTAL],
+                                       index.positions[Gimp.OrientationType.VERTICAL],
+                                       config.get_property("units"))
+    try:
+        templates.save_template(path, template)
+    except OSError as e:
+        raise ProcedureError(f"Failed to save guide template: {e}")
+
+    return f"Exported {len(template['horizontal']) + len(template['vertical'])} guides to {path}"
+
+
+def import_guide_template(image, drawables, config):
+    path = templates.resolve_template_path(config.get_property("template"), template_library_dir())
+    try:
+        template = templates.load_template(path)
+    except (OSError, ValueError) as e:
+        raise ProcedureError(f"Failed to load guide template: {e}")
+
+    images = target_images(image, config)
+    added = 0
+    for target in images:
+        h_positions, v_positions = templates.template_positions(template, target.get_width(),
+                                                                target.get_height())
+        target.undo_group_start()
+        try:
+            added += add_guides(target, h_positions, v_positions)
+        finally:
+            target.undo_group_end()
+
+    return f"Added {added} guides from {os.path.basename(path)} to {len(images)} image(s)"
+
+
+owenjklan_export_guide_template = procedure_runner(export_guide_template)
+owenjklan_import_guide_template = procedure_runner(import_guide_template)
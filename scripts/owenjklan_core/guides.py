@@ -0,0 +1,102 @@
+###
+# Snapshot of an image's guides, for matching and bulk removal.
+#
+# GIMP only exposes guides one at a time (find_next_guide, then orientation
+# and position per guide), so the index walks them exactly once and keeps
+# per-orientation arrays sorted by position. Lookups are then bisections in
+# Python rather than further PDB round trips.
+
+import bisect
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+
+# Matches allow this much difference, for guides placed by hand a pixel
+# off the computed position.
+DEFAULT_TOLERANCE = 1
+
+
+class GuideIndex:
+    def __init__(self, image):
+        self.image = image
+        # Orientation -> sorted guide positions, and their guide IDs
+        self.positions = {
+            Gimp.OrientationType.HORIZONTAL: [],
+            Gimp.OrientationType.VERTICAL: [],
+        }
+        self.guide_ids = {
+            Gimp.OrientationType.HORIZONTAL: [],
+            Gimp.OrientationType.VERTICAL: [],
+        }
+        self.unknown_ids = []
+
+        guides = []
+        guide_id = image.find_next_guide(0)  # Find the first guide
+        while guide_id != 0:
+            orientation = image.get_guide_orientation(guide_id)
+            if orientation in self.positions:
+                guides.append((orientation, image.get_guide_position(guide_id), guide_id))
+            else:
+                self.unknown_ids.append(guide_id)
+            guide_id = image.find_next_guide(guide_id)
+
+        for orientation, position, guide_id in sorted(guides, key=lambda x: x[1]):
+            self.positions[orientation].append(position)
+            self.guide_ids[orientation].append(guide_id)
+
+    def guides(self, orientation):
+        # (guide_id, position) pairs sorted by position
+        return list(zip(self.guide_ids[orientation], self.positions[orientation]))
+
+    def find(self, orientation, position, tolerance=DEFAULT_TOLERANCE):
+        # IDs of guides within 'tolerance' pixels of 'position'
+        positions = self.positions[orientation]
+        start = bisect.bisect_left(positions, position - tolerance)
+        end = bisect.bisect_right(positions, position + tolerance)
+        return self.guide_ids[orientation][start:end]
+
+    def contains(self, orientation, position, tolerance=DEFAULT_TOLERANCE):
+        return len(self.find(orientation, position, tolerance)) > 0
+
+    def add(self, orientation, position):
+        # Add a guide unless one already sits at exactly 'position'.
+        # Returns True if a guide was added.
+        if self.contains(orientation, position, tolerance=0):
+            return False
+
+        if orientation == Gimp.OrientationType.HORIZONTAL:
+            guide_id = self.image.add_hguide(position)
+        else:
+            guide_id = self.image.add_vguide(position)
+
+        insert_at = bisect.bisect_right(self.positions[orientation], position)
+        self.positions[orientation].insert(insert_at, position)
+        self.guide_ids[orientation].insert(insert_at, guide_id)
+        return True
+
+    def match(self, orientation, targets, tolerance=DEFAULT_TOLERANCE):
+        # IDs of guides near any of 'targets', each ID at most once
+        matched = []
+        seen = set()
+        for target in targets:
+            for guide_id in self.find(orientation, target, tolerance):
+                if guide_id not in seen:
+                    seen.add(guide_id)
+                    matched.append(guide_id)
+        return matched
+
+    def delete(self, guide_ids):
+        # Delete guides in one pass and drop them from the index
+        doomed = set(guide_ids)
+        for guide_id in guide_ids:
+            self.image.delete_guide(guide_id)
+
+        for orientation in self.positions:
+            kept = [(guide_id, position) for guide_id, position in self.guides(orientation)
+                    if guide_id not in doomed]
+            self.guide_ids[orientation] = [guide_id for guide_id, _ in kept]
+            self.positions[orientation] = [position for _, position in kept]
+
+        return len(doomed)
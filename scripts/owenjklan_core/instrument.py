@@ -0,0 +1,140 @@
+###
+# Opt-in instrumentation of every owenjklan procedure call.
+#
+# Set OWENJKLAN_INSTRUMENT_LOG to a file path and each call appends one JSON
+# line with the procedure name, wall time, returned status, image and
+# drawable sizes, and the number of calls made into libgimp (the Gimp
+# namespace; image, item and context functions are each a PDB round trip),
+# with the most frequent ones broken down by name.
+#
+# Set OWENJKLAN_PROFILE_DIR as well (or on its own) to also dump a cProfile
+# of each call to <dir>/<procedure>-<timestamp>.prof, for snakeviz/pstats.
+#
+# Counting uses sys.monitoring, so needs Python 3.12+. On older Pythons the
+# call counts are recorded as null.
+
+import collections
+import json
+import os
+import sys
+import time
+
+LOG_ENV = "OWENJKLAN_INSTRUMENT_LOG"
+PROFILE_ENV = "OWENJKLAN_PROFILE_DIR"
+
+TOP_CALLS = 15
+
+
+def enabled():
+    return bool(os.environ.get(LOG_ENV) or os.environ.get(PROFILE_ENV))
+
+
+class GimpCallCounter:
+    # Counts Python calls to gi functions of the Gimp namespace while active
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.tool_id = None
+
+    def on_call(self, code, instruction_offset, callable_object, arg0):
+        get_namespace = getattr(callable_object, "get_namespace", None)
+        if get_namespace is not None and get_namespace() == "Gimp":
+            self.counts[callable_object.get_name()] += 1
+
+    def __enter__(self):
+        monitoring = getattr(sys, "monitoring", None)
+        if monitoring is None:
+            return self
+
+        # Tool IDs 3 and 4 are not reserved for debuggers, coverage,
+        # profilers (cProfile uses PROFILER_ID) or optimizers
+        for tool_id in (3, 4):
+            if monitoring.get_tool(tool_id) is None:
+                self.tool_id = tool_id
+                break
+        else:
+            return self
+
+        monitoring.use_tool_id(self.tool_id, "owenjklan-instrument")
+        monitoring.register_callback(self.tool_id, monitoring.events.CALL, self.on_call)
+        monitoring.set_events(self.tool_id, monitoring.events.CALL)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.tool_id is not None:
+            monitoring = sys.monitoring
+            monitoring.set_events(self.tool_id, 0)
+            monitoring.register_callback(self.tool_id, monitoring.events.CALL, None)
+            monitoring.free_tool_id(self.tool_id)
+        return False
+
+    def total(self):
+        if self.tool_id is None:
+            return None
+        return sum(self.counts.values())
+
+
+def describe_image(image, drawables):
+    return {
+        "image": {
+            "width": image.get_width(),
+            "height": image.get_height(),
+            "layers": len(image.get_layers()),
+        },
+        "drawables": [
+            {"name": drawable.get_name(), "width": drawable.get_width(), "height": drawable.get_height()}
+            for drawable in drawables or []
+        ],
+    }
+
+
+def append_record(record):
+    log_path = os.environ.get(LOG_ENV)
+    if not log_path:
+        return
+    with open(os.path.expanduser(log_path), "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def instrumented_call(name, run_function, procedure, run_mode, image, drawables, config, run_data):
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "procedure": name,
+        "pid": os.getpid(),
+    }
+    # Sizes are read before the call, so these lookups are not counted
+    record.update(describe_image(image, drawables))
+
+    profiler = None
+    profile_dir = os.environ.get(PROFILE_ENV)
+    if profile_dir:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    counter = GimpCallCounter()
+    start = time.perf_counter()
+    try:
+        with counter:
+            if profiler is not None:
+                return_values = profiler.runcall(run_function, procedure, run_mode, image,
+                                                 drawables, config, run_data)
+            else:
+                return_values = run_function(procedure, run_mode, image, drawables, config, run_data)
+        record["status"] = return_values.index(0).value_nick
+        return return_values
+    except Exception as e:
+        record["status"] = "exception"
+        record["error"] = repr(e)
+        raise
+    finally:
+        record["seconds"] = round(time.perf_counter() - start, 6)
+        record["pdb_calls"] = counter.total()
+        record["top_calls"] = dict(counter.counts.most_common(TOP_CALLS))
+
+        if profiler is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+            profile_path = os.path.join(profile_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+            profiler.dump_stats(profile_path)
+            record["profile"] = profile_path
+
+        append_record(record)
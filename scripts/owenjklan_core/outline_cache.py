@@ -0,0 +1,133 @@
+###
+# On-disk cache of auto-outline results, keyed by layer content.
+#
+# Thumbnail work outlines the same cut-outs over and over (re-runs after an
+# undo, the same asset in many files, batch re-runs). An entry is the ring
+# of a region, the numpy engine's dilated outline alpha or the stroke
+# engine's stroke coverage, plus the color it was drawn in, stored as a
+# compressed .npz. A hit skips the dilation or the selection grow and stroke
+# (and the automatic color choice) and only composites the stored ring.
+#
+# The key hashes the region's pixels together with the engine, line width
+# and color. With a fixed color only the alpha channel can change the
+# outline, so only alpha is hashed; the automatic color also depends on the
+# RGB values, so then the whole region is.
+#
+# The directory is a least recently used cache: hits refresh an entry's
+# modification time, and after each store the oldest entries are deleted
+# until the total size is under the cap (OWENJKLAN_OUTLINE_CACHE_MB,
+# default 256, 0 disables the cache). Entries are written to a temporary
+# file and renamed, so concurrent batch workers can share the directory.
+#
+# No gi imports, like owenjklan_core.outline.
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+CACHE_SIZE_ENV = "OWENJKLAN_OUTLINE_CACHE_MB"
+DEFAULT_CACHE_MB = 256
+
+ENTRY_SUFFIX = ".npz"
+
+# Part of every key. Bump it when the stored rings change (eg. a different
+# dilation), so entries written by older code are never replayed.
+KEY_VERSION = 2
+
+
+def max_cache_bytes():
+    try:
+        megabytes = float(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_MB))
+    except ValueError:
+        megabytes = DEFAULT_CACHE_MB
+    return int(megabytes * 1024 * 1024)
+
+
+def cache_key(region, line_width, engine, colour=None):
+    # 'colour' is the RGB triple the outline is drawn in, or None when it
+    # is chosen automatically from 'region'
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{KEY_VERSION}:{engine}:{line_width}:{colour}:{region.dtype}:{region.shape}".encode())
+    data = region if colour is None else region[..., 3]
+    digest.update(np.ascontiguousarray(data).data)
+    return digest.hexdigest()
+
+
+class OutlineCache:
+    def __init__(self, directory, max_bytes=None):
+        self.directory = directory
+        self.max_bytes = max_cache_bytes() if max_bytes is None else max_bytes
+
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key):
+        # (outline alpha, colour) or None
+        if not self.enabled():
+            return None
+
+        path = self.path(key)
+        try:
+            with np.load(path) as entry:
+                outline_alpha, colour = entry["alpha"], entry["colour"].tolist()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            # Truncated or foreign file, drop it
+            self.remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return outline_alpha, colour
+
+    def put(self, key, outline_alpha, colour):
+        if not self.enabled():
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, alpha=outline_alpha, colour=np.asarray(colour))
+            os.replace(temp_path, self.path(key))
+        except OSError:
+            self.remove(temp_path)
+            return
+
+        self.evict()
+
+    def evict(self):
+        # Delete least recently used entries until under the size cap
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+
+    @staticmethod
+    def remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,74 @@
+###
+# Cached access to PDB procedures.
+#
+# Looking up a procedure and building its config are both round trips to
+# GIMP, as is every set_property() on the config. Procedures and configs are
+# kept per process (which matters most in the resident extension host), and
+# a config property is only set again when its value changed since the
+# previous call.
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+
+
+class PDBError(Exception):
+    pass
+
+
+# Procedure name -> Gimp.Procedure
+_procedures = {}
+# Procedure name -> (Gimp.ProcedureConfig, {property: last value set})
+_configs = {}
+
+
+def lookup(name: str) -> Gimp.Procedure:
+    procedure = _procedures.get(name)
+    if procedure is None:
+        procedure = Gimp.get_pdb().lookup_procedure(name)
+        if procedure is None:
+            raise PDBError(f"PDB procedure '{name}' not found")
+        _procedures[name] = procedure
+    return procedure
+
+
+def run(name: str, /, **properties) -> Gimp.ValueArray:
+    # Run 'name' with the given config properties ('_' in keyword names
+    # stands for '-'), raising PDBError unless it succeeds. Returns the full
+    # return values, index 0 being the status. 'name' is positional-only so
+    # procedures with a "name" argument (eg. gimp-layer-new) can be given it.
+    procedure = lookup(name)
+
+    cached = _configs.get(name)
+    if cached is None:
+        cached = (procedure.create_config(), {})
+        _configs[name] = cached
+    config, last_values = cached
+
+    for key, value in properties.items():
+        property_name = key.replace("_", "-")
+        if property_name not in last_values or last_values[property_name] != value:
+            config.set_property(property_name, value)
+            last_values[property_name] = value
+
+    results = procedure.run(config)
+
+    status = results.index(0)
+    if status != Gimp.PDBStatusType.SUCCESS:
+        error = Gimp.get_pdb().get_last_error()
+        raise PDBError(f"{name} failed ({status.value_nick}): {error}")
+
+    return results
+
+
+def new_layer(image: Gimp.Image, width: int, height: int, layer_type: Gimp.ImageType,
+              name: str, opacity: float = 100.0,
+              mode: Gimp.LayerMode = Gimp.LayerMode.NORMAL) -> Gimp.Layer:
+    results = run("gimp-layer-new", image=image, width=width, height=height,
+                  type=layer_type, name=name, opacity=opacity, mode=mode)
+
+    layer = results.index(1)
+    if layer is None:
+        raise PDBError("gimp-layer-new returned no layer")
+    return layer
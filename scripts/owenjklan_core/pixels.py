@@ -0,0 +1,238 @@
+###
+# Reading and writing drawable pixels as NumPy arrays through GEGL buffers.
+#
+# Every call takes the babl format to use (see FORMATS), and GEGL converts
+# while copying out or in, so there is no conversion pass in NumPy. The
+# default, pixel_format(), is RGBA in the image's perceptual (R'G'B') space:
+# uint8 for 8-bit images, float32 for every other precision so higher bit
+# depths are not truncated. Arrays are (height, width, channels), or
+# (height, width) for single channel formats such as "A u8".
+#
+# GEGL's Python binding copies a region into a bytes object on get() and
+# out of one on set(). Besides those, reads make no copy (arrays are views
+# of the bytes, read-only unless writable=True asks for the one copy a
+# mutable array needs) and writes make one, to hand the array over as bytes.
+#
+# Regions too big to hold at once are processed in row bands of at most
+# 'max_bytes' with iter_tiles(), writing each band back with write_shadow()
+# and merging once with merge_shadow().
+
+import math
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+gi.require_version('Gegl', '0.4')
+from gi.repository import Gegl
+
+import numpy as np
+
+# Babl format -> (NumPy dtype, channels)
+FORMATS = {
+    "R'G'B'A u8": (np.uint8, 4),
+    "R'G'B'A u16": (np.uint16, 4),
+    "R'G'B'A float": (np.float32, 4),
+    "RGBA float": (np.float32, 4),
+    "R'G'B' u8": (np.uint8, 3),
+    "R'G'B' float": (np.float32, 3),
+    "Y' u8": (np.uint8, 1),
+    "Y' float": (np.float32, 1),
+    "A u8": (np.uint8, 1),
+    "A float": (np.float32, 1),
+}
+
+# Largest band iter_tiles() reads at once
+TILE_BYTES = 64 * 1024 * 1024
+
+# Pixels sampled to estimate a drawable's colours
+SAMPLE_PIXELS = 65536
+
+U8_PRECISIONS = (
+    Gimp.Precision.U8_LINEAR,
+    Gimp.Precision.U8_NON_LINEAR,
+    Gimp.Precision.U8_PERCEPTUAL,
+)
+
+
+def pixel_format(drawable):
+    # Default babl format name and matching NumPy dtype for 'drawable'
+    if drawable.get_image().get_precision() in U8_PRECISIONS:
+        return "R'G'B'A u8", np.uint8
+    return "R'G'B'A float", np.float32
+
+
+def alpha_format(drawable):
+    # Alpha only format at the drawable's default depth
+    return "A u8" if pixel_format(drawable)[1] == np.uint8 else "A float"
+
+
+def format_layout(babl_format):
+    # (dtype, channels) of 'babl_format'
+    layout = FORMATS.get(babl_format)
+    if layout is None:
+        raise ValueError(f"Unsupported pixel format '{babl_format}'")
+    return layout
+
+
+def _as_array(data, babl_format, width, height, writable):
+    dtype, channels = format_layout(babl_format)
+    if writable:
+        data = bytearray(data)
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    return np.frombuffer(data, dtype=dtype).reshape(shape)
+
+
+def read_pixels(drawable, x, y, width, height, babl_format=None, writable=False):
+    # Array of the region, in drawable coordinates
+    babl_format = babl_format or pixel_format(drawable)[0]
+    rect = Gegl.Rectangle.new(x, y, width, height)
+    data = drawable.get_buffer().get(rect, 1.0, babl_format, Gegl.AbyssPolicy.CLAMP)
+    return _as_array(data, babl_format, width, height, writable)
+
+
+def band_rows(width, babl_format, max_bytes=TILE_BYTES):
+    # Rows of 'width' pixels that fit in 'max_bytes' (at least one)
+    dtype, channels = format_layout(babl_format)
+    return max(1, max_bytes // (width * channels * np.dtype(dtype).itemsize))
+
+
+def iter_tiles(drawable, x, y, width, height, babl_format=None, max_bytes=TILE_BYTES, writable=False):
+    # Yield (band_y, array) for full width row bands of the region, each at
+    # most 'max_bytes', top to bottom
+    babl_format = babl_format or pixel_format(drawable)[0]
+    rows = band_rows(width, babl_format, max_bytes)
+    for band_y in range(y, y + height, rows):
+        band_height = min(rows, y + height - band_y)
+        yield band_y, read_pixels(drawable, x, band_y, width, band_height, babl_format, writable)
+
+
+def sample_step(width, height, max_pixels=SAMPLE_PIXELS):
+    # Stride in both directions that leaves about 'max_pixels' of a
+    # width x height region
+    return max(1, math.ceil(math.sqrt(width * height / max_pixels)))
+
+
+def sample_pixels(drawable, max_pixels=SAMPLE_PIXELS, babl_format=None):
+    # About 'max_pixels' of the drawable in one buffer fetch at a reduced
+    # scale, which GEGL serves from its mipmaps instead of reading every
+    # pixel
+    babl_format = babl_format or pixel_format(drawable)[0]
+    step = sample_step(drawable.get_width(), drawable.get_height(), max_pixels)
+
+    width = math.ceil(drawable.get_width() / step)
+    height = math.ceil(drawable.get_height() / step)
+    rect = Gegl.Rectangle.new(0, 0, width, height)
+    data = drawable.get_buffer().get(rect, 1.0 / step, babl_format, Gegl.AbyssPolicy.CLAMP)
+    return _as_array(data, babl_format, width, height, False)
+
+
+def content_bounds(drawable, max_bytes=TILE_BYTES):
+    # Bounding box (x, y, width, height) of the drawable's non-transparent
+    # pixels, or None if it is fully transparent. Only the alpha channel is
+    # read, a quarter of the data of a full RGBA read, in bands of at most
+    # 'max_bytes'.
+    width = drawable.get_width()
+    height = drawable.get_height()
+
+    row_hits = []
+    col_hits = np.zeros(width, dtype=bool)
+    for _, alpha in iter_tiles(drawable, 0, 0, width, height, alpha_format(drawable), max_bytes):
+        band_rows_hit = alpha.any(axis=1)
+        row_hits.append(band_rows_hit)
+        if band_rows_hit.any():
+            col_hits |= alpha[band_rows_hit].any(axis=0)
+
+    rows = np.flatnonzero(np.concatenate(row_hits)) if row_hits else []
+    if len(rows) == 0:
+        return None
+    cols = np.flatnonzero(col_hits)
+
+    return (int(cols[0]), int(rows[0]),
+            int(cols[-1] - cols[0] + 1), int(rows[-1] - rows[0] + 1))
+
+
+def grow_bounds(bounds, margin, width, height):
+    # 'bounds' grown by 'margin' on every side and clipped to width x height
+    x, y, w, h = bounds
+    x0 = max(x - margin, 0)
+    y0 = max(y - margin, 0)
+    x1 = min(x + w + margin, width)
+    y1 = min(y + h + margin, height)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def write_shadow(drawable, pixels, x, y, babl_format=None):
+    # Put 'pixels' at (x, y) of the drawable's shadow buffer. Nothing is
+    # visible until merge_shadow().
+    babl_format = babl_format or pixel_format(drawable)[0]
+    dtype, _ = format_layout(babl_format)
+    height, width = pixels.shape[:2]
+
+    # tobytes() is the one copy; it also lays out non-contiguous views
+    data = pixels.tobytes() if pixels.dtype == dtype else pixels.astype(dtype).tobytes()
+
+    shadow = drawable.get_shadow_buffer()
+    shadow.set(Gegl.Rectangle.new(x, y, width, height), babl_format, data)
+    shadow.flush()
+
+
+def merge_shadow(drawable, x, y, width, height):
+    # Apply the shadow buffer to the region as one undo step
+
+    # merge_shadow() only applies inside the selection, so it is dropped for
+    # the merge and restored afterwards.
+    image = drawable.get_image()
+    saved_selection = None
+    if not Gimp.Selection.is_empty(image):
+        saved_selection = Gimp.Selection.save(image)
+        Gimp.Selection.none(image)
+
+    drawable.merge_shadow(True)
+    drawable.update(x, y, width, height)
+
+    if saved_selection is not None:
+        image.select_item(Gimp.ChannelOps.REPLACE, saved_selection)
+        image.remove_channel(saved_selection)
+
+
+def write_pixels(drawable, pixels, x, y, babl_format=None):
+    # Write 'pixels' at (x, y) through the shadow buffer, so the change gets
+    # a normal undo step.
+    write_shadow(drawable, pixels, x, y, babl_format)
+    height, width = pixels.shape[:2]
+    merge_shadow(drawable, x, y, width, height)
+
+
+def fill_pixels(drawable, value, x=0, y=0, width=None, height=None, babl_format=None,
+                max_bytes=TILE_BYTES):
+    # Fill the region with 'value' (a pixel of 'babl_format'), one band
+    # array reused for every band of at most 'max_bytes'
+    babl_format = babl_format or pixel_format(drawable)[0]
+    dtype, channels = format_layout(babl_format)
+    width = drawable.get_width() if width is None else width
+    height = drawable.get_height() if height is None else height
+
+    rows = min(band_rows(width, babl_format, max_bytes), height)
+    band = np.empty((rows, width) if channels == 1 else (rows, width, channels), dtype=dtype)
+    band[...] = value
+
+    for band_y in range(y, y + height, rows):
+        write_shadow(drawable, band[:min(rows, y + height - band_y)], x, band_y, babl_format)
+    merge_shadow(drawable, x, y, width, height)
+
+
+def linear_to_perceptual(value):
+    # sRGB transfer function for a single 0.0 - 1.0 channel value
+    if value <= 0.0031308:
+        return value * 12.92
+    return 1.055 * value ** (1.0 / 2.4) - 0.055
+
+
+def color_to_pixel(color, dtype):
+    # RGB triple of a Gegl.Color in the range used by arrays of 'dtype'
+    r, g, b, _ = color.get_rgba()
+    rgb = [linear_to_perceptual(min(max(c, 0.0), 1.0)) for c in (r, g, b)]
+    if dtype == np.uint8:
+        return [round(c * 255.0) for c in rgb]
+    return rgb
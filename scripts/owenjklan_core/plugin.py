@@ -0,0 +1,199 @@
+###
+# Procedure registration shared by every owenjklan plug-in and by the resident
+# extension host.
+#
+# Procedures are built purely from the owenjklan_core.procedures table. The
+# module implementing a procedure is only imported the first time that
+# procedure runs, so GIMP's query pass never pays for it.
+#
+# Most procedures are written as an "operation": a function of
+# (image, drawables, config) that does the work and returns the message to
+# show. procedure_runner() turns it into a PDB run function that pushes the
+# context, opens an undo group, flushes displays and reports the message.
+# Recipes (owenjklan_core.recipes) call operations directly to run several
+# of them under a single undo group.
+#
+# Procedures marked "dialog" in the table get a GimpUi.ProcedureDialog of
+# their arguments when run interactively.
+
+import importlib
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+from gi.repository import GLib
+from gi.repository import GObject
+
+from owenjklan_core import instrument
+from owenjklan_core.procedures import PROCEDURES, function_name, procedure_names
+
+# Procedure name -> resolved run function
+_run_functions = {}
+
+# GimpUi.init() has run in this process
+_ui_initialized = False
+
+
+def resolve_run_function(name):
+    run_function = _run_functions.get(name)
+    if run_function is None:
+        module = importlib.import_module("owenjklan_core." + PROCEDURES[name]["plugin"])
+        run_function = getattr(module, function_name(name))
+        _run_functions[name] = run_function
+    return run_function
+
+
+def show_dialog(procedure, config, name):
+    # Let the user edit the arguments. Returns False if they cancelled.
+
+    # GimpUi (and GTK with it) is only loaded for interactive runs of
+    # procedures with a dialog
+    gi.require_version('GimpUi', '3.0')
+    from gi.repository import GimpUi
+
+    global _ui_initialized
+    if not _ui_initialized:
+        GimpUi.init(PROCEDURES[name]["plugin"])
+        _ui_initialized = True
+
+    dialog = GimpUi.ProcedureDialog.new(procedure, config, PROCEDURES[name]["label"].rstrip("."))
+    dialog.fill(None)
+    accepted = dialog.run()
+    dialog.destroy()
+    return accepted
+
+
+def run_procedure(procedure, run_mode, image, drawables, config, name):
+    # 'name' is the run_data given to Gimp.ImageProcedure.new(). It is the
+    # table name even when the procedure was registered under another name
+    # (eg. the resident host's temporary procedures).
+    if run_mode == Gimp.RunMode.INTERACTIVE and PROCEDURES[name].get("dialog"):
+        if not show_dialog(procedure, config, name):
+            return procedure.new_return_values(Gimp.PDBStatusType.CANCEL, GLib.Error())
+
+    run_function = resolve_run_function(name)
+    if instrument.enabled():
+        return instrument.instrumented_call(name, run_function, procedure, run_mode, image,
+                                            drawables, config, name)
+    return run_function(procedure, run_mode, image, drawables, config, name)
+
+
+class ProcedureError(Exception):
+    # Raised by operations to fail with a message shown to the user
+    def __init__(self, message, status=Gimp.PDBStatusType.EXECUTION_ERROR):
+        super().__init__(message)
+        self.status = status
+
+
+def procedure_runner(operation):
+    def run(procedure, run_mode, image, drawables, config, run_data):
+        # Push the current context
+        if not Gimp.context_push():
+            Gimp.message(f"{procedure.get_menu_label()} failed to push context!")
+            return procedure.new_return_values(Gimp.PDBStatusType.FAILED, GLib.Error())
+
+        image.undo_group_start()
+        try:
+            message = operation(image, drawables, config)
+        except ProcedureError as e:
+            Gimp.message(str(e))
+            return procedure.new_return_values(e.status, GLib.Error())
+        finally:
+            image.undo_group_end()
+            # Pop the context back off the stack
+            Gimp.context_pop()
+
+        Gimp.displays_flush()
+        if message:
+            Gimp.message(message)
+
+        return procedure.new_return_values(Gimp.PDBStatusType.SUCCESS, GLib.Error())
+
+    run.operation = operation
+    return run
+
+
+def resolve_operation(name):
+    # The operation behind a procedure, or None if it has a custom run
+    # function (eg. one with return values)
+    return getattr(resolve_run_function(name), "operation", None)
+
+
+def add_arguments(procedure, arguments):
+    for argument in arguments:
+        kind = argument["type"]
+        common = (argument["name"], argument["nick"], argument["blurb"])
+
+        if kind == "choice":
+            choice = Gimp.Choice.new()
+            for choice_id, (nick, label) in enumerate(argument["choices"]):
+                choice.add(nick, choice_id, label, "")
+            procedure.add_choice_argument(*common, choice, argument["default"],
+                                          GObject.ParamFlags.READWRITE)
+        elif kind in ("int", "double"):
+            add_argument = getattr(procedure, f"add_{kind}_argument")
+            add_argument(*common, argument["min"], argument["max"], argument["default"],
+                         GObject.ParamFlags.READWRITE)
+        elif kind in ("boolean", "string"):
+            add_argument = getattr(procedure, f"add_{kind}_argument")
+            add_argument(*common, argument["default"], GObject.ParamFlags.READWRITE)
+        else:
+            raise ValueError(f"Unsupported argument type '{kind}' for {argument['name']}")
+
+
+def add_return_values(procedure, return_values):
+    for return_value in return_values:
+        kind = return_value["type"]
+        add_return_value = getattr(procedure, f"add_{kind}_return_value")
+        add_return_value(return_value["name"], return_value["nick"], return_value["blurb"],
+                         GObject.ParamFlags.READWRITE)
+
+
+def set_int32_array_return_value(return_values, index, values):
+    # Replace the return value at 'index' (0 is the status) with an int32
+    # array of 'values'
+    value = GObject.Value(Gimp.Int32Array)
+    Gimp.value_set_int32_array(value, [int(v) for v in values])
+    return_values.remove(index)
+    return_values.insert(index, value)
+
+
+def create_procedure(plug_in, name, proc_type, procedure_name=None):
+    procedure_details = PROCEDURES[name]
+
+    procedure = Gimp.ImageProcedure.new(
+        plug_in, procedure_name or name, proc_type,
+        run_procedure, name
+    )
+
+    procedure.set_image_types(procedure_details["image_types"])
+
+    procedure.set_menu_label(procedure_details["label"])
+    procedure.add_menu_path(procedure_details["menu_path"])
+
+    procedure.set_documentation(
+        procedure_details["documentation_title"],
+        procedure_details["documentation_body"],
+        name
+    )
+    procedure.set_attribution("Owen Klan", "Owen Klan", "2024")
+
+    add_arguments(procedure, procedure_details.get("arguments", []))
+    add_return_values(procedure, procedure_details.get("return_values", []))
+
+    return procedure
+
+
+class OwenjklanPlugIn (Gimp.PlugIn):
+    # Subclasses set this to the "plugin" value of their table entries
+    plugin_name = None
+
+    def do_query_procedures(self):
+        return procedure_names(self.plugin_name)
+
+    def do_set_i18n (self, name):
+        return False
+
+    def do_create_procedure(self, name):
+        return create_procedure(self, name, Gimp.PDBProcType.PLUGIN)
@@ -0,0 +1,411 @@
+###
+# Declarative procedure table for all owenjklan plug-ins.
+#
+# This module must stay free of gi imports: it is read at query time, when
+# GIMP only needs names, labels and menu paths.
+#
+# Each entry's "plugin" is both the plug-in directory that registers it and
+# the owenjklan_core module holding its run function. The run function is
+# named after the procedure, with '-' replaced by '_'.
+#
+# Optional "arguments" and "return_values" are added to the procedure in
+# order, see owenjklan_core.plugin.add_arguments() and add_return_values()
+# for the supported types.
+#
+# Entries with "dialog" show a dialog of their arguments when run
+# interactively, and their labels end in "..." as GIMP's menus expect.
+# The others run straight away (eg. from a shortcut or Stream Deck button)
+# with their default arguments; other values can be given from scripts,
+# batch runs or recipes.
+
+GUIDE_GROUPS_MENU_PATH = "<Image>/Image/Guide Groups/"
+
+GUIDE_TOLERANCE_ARGUMENT = {
+    "name": "tolerance",
+    "type": "int",
+    "nick": "Tolerance",
+    "blurb": "Remove guides within this many pixels of a target position",
+    "min": 0,
+    "max": 100,
+    "default": 1,
+}
+
+ALL_IMAGES_ARGUMENT = {
+    "name": "all-images",
+    "type": "boolean",
+    "nick": "All images",
+    "blurb": "Apply to every open image instead of only this one",
+    "default": False,
+}
+
+RESIZE_SCALE_ARGUMENT = {
+    "name": "scale",
+    "type": "double",
+    "nick": "Scale",
+    "blurb": "Scale factor for the new size, the original content is centered",
+    "min": 0.01,
+    "max": 100.0,
+    "default": 1.25,
+}
+
+RESIZE_MODE_ARGUMENTS = [
+    {
+        "name": "mode",
+        "type": "choice",
+        "nick": "Mode",
+        "blurb": "Grow by the scale factor, or crop to the content and pad it",
+        "choices": [
+            ("scale", "Grow by scale"),
+            ("fit-content", "Crop to content, then pad"),
+        ],
+        "default": "scale",
+    },
+    {
+        "name": "margin",
+        "type": "int",
+        "nick": "Margin",
+        "blurb": "Fit content mode: padding around the content in pixels",
+        "min": 0,
+        "max": 65536,
+        "default": 0,
+    },
+    {
+        "name": "aspect-ratio",
+        "type": "string",
+        "nick": "Aspect ratio",
+        "blurb": "Fit content mode: pad to this aspect ratio (eg. 16:9), empty to keep the content's",
+        "default": "",
+    },
+]
+
+GUIDE_TEMPLATE_ARGUMENT = {
+    "name": "template",
+    "type": "string",
+    "nick": "Template",
+    "blurb": "Template name in the guide template library, or a path to a .json file",
+    "default": "default",
+}
+
+QUICK_BLACK_FILL_MODE_ARGUMENT = {
+    "name": "fill-mode",
+    "type": "choice",
+    "nick": "Fill mode",
+    "blurb": "Fill the layer's pixels, or keep it empty and render it black with a non-destructive filter",
+    "choices": [
+        ("pixels", "Fill layer pixels"),
+        ("filter", "Non-destructive filter (no pixel buffer)"),
+    ],
+    "default": "pixels",
+}
+
+PROCEDURES = {
+    "owenjklan-auto-outline": {
+        "plugin": "auto_outline",
+        "label": "Auto-outline",
+        "menu_path": "<Image>/Layer/",
+        "image_types": "RGBA",  # Require RGB and Alpha channel
+        "documentation_title": "Auto-outline plug-in",
+        "documentation_body": "This plug-in automatically applies a stroke outline around the contents of"
+                              " a layer. The 'stroke' engine grows and strokes the current selection (eg."
+                              " from 'Alpha to Selection'), the 'numpy' engine dilates the layer's alpha"
+                              " channel directly in one buffer read and write.",
+        "arguments": [
+            {
+                "name": "engine",
+                "type": "choice",
+                "nick": "Engine",
+                "blurb": "How the outline is computed",
+                "choices": [
+                    ("stroke", "Grow selection and stroke"),
+                    ("numpy", "NumPy alpha dilation"),
+                ],
+                "default": "stroke",
+            },
+            {
+                "name": "line-width",
+                "type": "int",
+                "nick": "Line width",
+                "blurb": "Outline width in pixels",
+                "min": 1,
+                "max": 256,
+                "default": 6,
+            },
+            {
+                "name": "color",
+                "type": "choice",
+                "nick": "Color",
+                "blurb": "Outline color",
+                "choices": [
+                    ("foreground", "Foreground color"),
+                    ("auto", "Black or white, contrasting with the layer"),
+                ],
+                "default": "foreground",
+            },
+        ],
+    },
+    "owenjklan-quick-black-top": {
+        "plugin": "quick_black",
+        "label": "Quick Black Layer - Top",
+        "menu_path": "<Image>/Layer/",
+        "image_types": "RGBA",  # Require RGB and Alpha channel
+        "documentation_title": "Quick Black Layer - Top",
+        "documentation_body": "Create a new black layer at the top or bottom of the layer stack.",
+        "arguments": [QUICK_BLACK_FILL_MODE_ARGUMENT],
+    },
+    "owenjklan-quick-black-bottom": {
+        "plugin": "quick_black",
+        "label": "Quick Black Layer - Bottom",
+        "menu_path": "<Image>/Layer/",
+        "image_types": "RGBA",  # Require RGB and Alpha channel
+        "documentation_title": "Quick Black Layer - Bottom",
+        "documentation_body": "Create a new black layer at the top or bottom of the layer stack.",
+        "arguments": [QUICK_BLACK_FILL_MODE_ARGUMENT],
+    },
+    "owenjklan-image-canvas-centered-resize": {
+        "plugin": "centered_resize",
+        "label": "Centered Canvas Resize",
+        "menu_path": "<Image>/Image/",
+        "image_types": "*",
+        "documentation_title": "Resize image canvas by 25%, centering original content.",
+        "documentation_body": "Resize an image canvas by 25% (or the given scale) and center the original"
+                              " content. Can be applied to every open image at once. The 'fit-content'"
+                              " mode crops the canvas to the layers' content and pads it by a margin"
+                              " and/or to an aspect ratio instead.",
+        "arguments": [
+            RESIZE_SCALE_ARGUMENT,
+            ALL_IMAGES_ARGUMENT,
+            *RESIZE_MODE_ARGUMENTS,
+        ],
+    },
+    "owenjklan-layer-boundary-centered-resize": {
+        "plugin": "centered_resize",
+        "label": "Centered Boundary Resize",
+        "menu_path": "<Image>/Layer/",
+        "image_types": "*",
+        "documentation_title": "Resize layer boundary by 25%, centering original content.",
+        "documentation_body": "Resize a layer boundary by 25% (or the given scale) and center the original"
+                              " content, for the selected layers, all layers, or all layers of every open"
+                              " image, in one undo step per image. The 'fit-content' mode crops each layer"
+                              " to its content and pads it by a margin and/or to an aspect ratio instead.",
+        "arguments": [
+            RESIZE_SCALE_ARGUMENT,
+            {
+                "name": "scope",
+                "type": "choice",
+                "nick": "Layers",
+                "blurb": "Which layers to resize",
+                "choices": [
+                    ("selected", "Selected layers"),
+                    ("all-layers", "All layers"),
+                    ("all-images", "All layers of all open images"),
+                ],
+                "default": "selected",
+            },
+            *RESIZE_MODE_ARGUMENTS,
+        ],
+    },
+    "owenjklan-add-guide-groups-edges": {
+        "plugin": "guide_groups",
+        "label": "Add edges",
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Add guides at all edges",
+        "documentation_body": "Add guides at all edges",
+    },
+    "owenjklan-remove-guide-groups-edges": {
+        "plugin": "guide_groups",
+        "label": "Remove edges",
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Remove guides at all edges",
+        "documentation_body": "Remove guides at all edges",
+        "arguments": [GUIDE_TOLERANCE_ARGUMENT],
+    },
+    "owenjklan-add-guide-groups-halves": {
+        "plugin": "guide_groups",
+        "label": "Add halves",
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Add horizontal and vertical guide at 50%",
+        "documentation_body": "Add horizontal and vertical guide at 50%",
+    },
+    "owenjklan-remove-guide-groups-halves": {
+        "plugin": "guide_groups",
+        "label": "Remove halves",
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Remove horizontal and vertical guide at 50%",
+        "documentation_body": "Remove horizontal and vertical guide at 50%",
+        "arguments": [GUIDE_TOLERANCE_ARGUMENT],
+    },
+    "owenjklan-add-guide-groups-thirds": {
+        "plugin": "guide_groups",
+        "label": "Add thirds",
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Add horizontal and vertical guides at 33% and 66%",
+        "documentation_body": "Add horizontal and vertical guides at 33% and 66%",
+    },
+    "owenjklan-remove-guide-groups-thirds": {
+        "plugin": "guide_groups",
+        "label": "Remove thirds",
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Remove horizontal and vertical guides at 33% and 66%",
+        "documentation_body": "Remove horizontal and vertical guides at 33% and 66%",
+        "arguments": [GUIDE_TOLERANCE_ARGUMENT],
+    },
+    "owenjklan-add-guide-groups-quarters": {
+        "plugin": "guide_groups",
+        "label": "Add quarters",
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Add horizontal and vertical guides at 25%, 50% and 75%",
+        "documentation_body": "Add horizontal and vertical guides at 25%, 50% and 75%",
+    },
+    "owenjklan-remove-guide-groups-quarters": {
+        "plugin": "guide_groups",
+        "label": "Remove quarters",
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Remove horizontal and vertical guides at 25%, 50% and 75%",
+        "documentation_body": "Remove horizontal and vertical guides at 25%, 50% and 75%",
+        "arguments": [GUIDE_TOLERANCE_ARGUMENT],
+    },
+    "owenjklan-add-guide-grid": {
+        "plugin": "guide_groups",
+        "label": "Add grid...",
+        "dialog": True,
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Add a parametric grid of guides",
+        "documentation_body": "Add guides splitting the image into N divisions and/or at golden-ratio splits,"
+                              " optionally inset by a margin. Positions that already have a guide are"
+                              " skipped. Can be applied to every open image at once.",
+        "arguments": [
+            {
+                "name": "divisions",
+                "type": "int",
+                "nick": "Divisions",
+                "blurb": "Split each axis into this many equal parts",
+                "min": 1,
+                "max": 100,
+                "default": 3,
+            },
+            {
+                "name": "golden-ratio",
+                "type": "boolean",
+                "nick": "Golden ratio",
+                "blurb": "Also add guides at the golden-ratio splits",
+                "default": False,
+            },
+            {
+                "name": "margin",
+                "type": "int",
+                "nick": "Margin",
+                "blurb": "Inset in pixels from every edge, guides are added at the inset",
+                "min": 0,
+                "max": 65536,
+                "default": 0,
+            },
+            ALL_IMAGES_ARGUMENT,
+        ],
+    },
+    "owenjklan-export-guide-template": {
+        "plugin": "guide_groups",
+        "label": "Export template...",
+        "dialog": True,
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Export the image's guides as a JSON guide template",
+        "documentation_body": "Save the positions of the image's guides to a JSON template, as percentages"
+                              " of the image size or as pixels. An existing template is only replaced"
+                              " with 'overwrite'.",
+        "arguments": [
+            GUIDE_TEMPLATE_ARGUMENT,
+            {
+                "name": "units",
+                "type": "choice",
+                "nick": "Units",
+                "blurb": "Store positions as percentages or pixels",
+                "choices": [
+                    ("percent", "Percent of image size"),
+                    ("pixels", "Pixels"),
+                ],
+                "default": "percent",
+            },
+            {
+                "name": "overwrite",
+                "type": "boolean",
+                "nick": "Overwrite",
+                "blurb": "Replace the template if it already exists",
+                "default": False,
+            },
+        ],
+    },
+    "owenjklan-import-guide-template": {
+        "plugin": "guide_groups",
+        "label": "Import template...",
+        "dialog": True,
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Add guides from a JSON guide template",
+        "documentation_body": "Add the guides of a JSON template, skipping positions that already have a"
+                              " guide. Can be applied to every open image at once.",
+        "arguments": [
+            GUIDE_TEMPLATE_ARGUMENT,
+            ALL_IMAGES_ARGUMENT,
+        ],
+    },
+    "owenjklan-list-guides": {
+        "plugin": "guide_groups",
+        "label": "List (Debug to Console)",
+        "menu_path": GUIDE_GROUPS_MENU_PATH,
+        "image_types": "*",
+        "documentation_title": "Dump image guides",
+        "documentation_body": "Dump image guides to the console and return their positions.",
+        "return_values": [
+            {
+                "name": "horizontal-positions",
+                "type": "int32_array",
+                "nick": "Horizontal positions",
+                "blurb": "Positions of the horizontal guides, in pixels, sorted",
+            },
+            {
+                "name": "vertical-positions",
+                "type": "int32_array",
+                "nick": "Vertical positions",
+                "blurb": "Positions of the vertical guides, in pixels, sorted",
+            },
+        ],
+    },
+    "owenjklan-run-recipe": {
+        "plugin": "recipes",
+        "label": "Run recipe...",
+        "dialog": True,
+        "menu_path": "<Image>/Image/",
+        "image_types": "*",
+        "documentation_title": "Run a recipe of owenjklan procedures",
+        "documentation_body": "Run the steps of a JSON or TOML recipe, each naming an owenjklan procedure and"
+                              " its arguments, in one invocation with a single undo step.",
+        "arguments": [
+            {
+                "name": "recipe",
+                "type": "string",
+                "nick": "Recipe",
+                "blurb": "Recipe name in the recipe library, or a path to a .json or .toml file",
+                "default": "thumbnail-prep",
+            },
+        ],
+    },
+}
+
+
+def procedure_names(plugin=None):
+    # All procedure names, or only those registered by one plug-in
+    return [name for name, details in PROCEDURES.items()
+            if plugin is None or details["plugin"] == plugin]
+
+
+def function_name(name):
+    return name.replace("-", "_")
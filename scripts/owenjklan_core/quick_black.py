@@ -0,0 +1,86 @@
+###
+# Quick Black, two convenience functions:
+#
+# - Add a new layer, the same size as the image, filled with black at the
+#   very bottom of the layer stack
+# - The same as the previous command, except this time the layer will be placed
+#   at the top of the layer stack and will have a default opacity of 0.75
+#
+# With the "filter" fill mode the layer's pixels are never written. The new
+# layer stays transparent (GEGL allocates no tiles for it) and a
+# non-destructive gimp:set-alpha filter renders it as opaque black. This
+# avoids a full-resolution pixel buffer and its undo copy (eg. ~130 MB for
+# a 7680x4320 8-bit image).
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+gi.require_version('Gegl', '0.4')
+from gi.repository import Gegl
+
+from owenjklan_core import pdb
+from owenjklan_core.plugin import ProcedureError, procedure_runner
+
+
+def create_new_layer(image, opacity: float = 100.0) -> Gimp.Layer:
+    # Raises PDBError if the layer could not be created
+    return pdb.new_layer(image, image.get_width(), image.get_height(),
+                         Gimp.ImageType.RGBA_IMAGE, "Quick Black", opacity)
+
+
+def insert_filled_layer(image, position, opacity):
+    black_color = Gegl.Color()
+    black_color.set_rgba(0, 0, 0, 1.0)
+    Gimp.context_set_foreground(black_color)
+
+    new_layer = create_new_layer(image, opacity)
+    new_layer.fill(Gimp.FillType.FOREGROUND)
+    image.insert_layer(new_layer, None, position)
+    return new_layer
+
+
+def insert_filter_layer(image, position, opacity):
+    # A new layer is transparent black (0, 0, 0, 0), setting its alpha to 1
+    # makes it opaque black without touching its buffer.
+    new_layer = create_new_layer(image, opacity)
+    image.insert_layer(new_layer, None, position)
+
+    # gimp:set-alpha is GIMP's own operation (GEGL has no set-alpha)
+    black_filter = Gimp.DrawableFilter.new(new_layer, "gimp:set-alpha", "Quick Black")
+    if black_filter is None:
+        # Don't leave an empty "Quick Black" layer behind
+        image.remove_layer(new_layer)
+        raise ProcedureError("Failed to create the Quick Black filter (gimp:set-alpha).")
+    black_filter.get_config().set_property("value", 1.0)
+    black_filter.update()
+    new_layer.append_filter(black_filter)
+    return new_layer
+
+
+def add_black_layer(image, position, opacity, fill_mode):
+    try:
+        if fill_mode == "filter":
+            insert_filter_layer(image, position, opacity)
+        else:
+            insert_filled_layer(image, position, opacity)
+    except pdb.PDBError as e:
+        raise ProcedureError(f"Failed to create a new layer! {e}")
+
+
+def quick_black_top(image, drawables, config):
+    add_black_layer(image, 0, 80.0, config.get_property("fill-mode"))
+    return "New Black layer added to top of stack."
+
+
+def quick_black_bottom(image, drawables, config):
+    # 0 is the 'top' layer. The bottom will be the
+    # count of layers already in the image
+    layer_bottom_pos = len(image.get_layers())
+
+    add_black_layer(image, layer_bottom_pos, 100.0, config.get_property("fill-mode"))
+    return "New Black layer added to bottom of stack."
+
+
+owenjklan_quick_black_top = procedure_runner(quick_black_top)
+owenjklan_quick_black_bottom = procedure_runner(quick_black_bottom)
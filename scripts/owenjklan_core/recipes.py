@@ -0,0 +1,161 @@
+###
+# Recipes: a chain of existing owenjklan procedures run as one procedure.
+#
+# A recipe is a JSON (or, with Python 3.11+, TOML) file naming procedures
+# and their arguments:
+#
+#   {
+#     "steps": [
+#       {"procedure": "owenjklan-image-canvas-centered-resize", "arguments": {"scale": 1.25}},
+#       {"procedure": "owenjklan-quick-black-bottom"},
+#       {"procedure": "owenjklan-auto-outline", "layers": ["Subject"],
+#        "arguments": {"engine": "numpy"}},
+#       {"procedure": "owenjklan-add-guide-groups-thirds"}
+#     ]
+#   }
+#
+# "layers" optionally selects layers by name before a step runs.
+#
+# Steps call each procedure's operation in this process, under the recipe's
+# single undo group, and their messages are not shown. Each step gets its
+# own context push, like a separate procedure call would, so context
+# changes made by one step (eg. Quick Black setting the foreground to
+# black) do not carry into the next.
+# Parsed recipes and the configs built for their steps are cached until the
+# file changes, so repeat runs (eg. from the resident extension host) only
+# pay for the work itself.
+
+import json
+import os
+
+import gi
+
+gi.require_version('Gimp', '3.0')
+from gi.repository import Gimp
+
+from owenjklan_core import pdb
+from owenjklan_core.plugin import ProcedureError, procedure_runner, resolve_operation
+from owenjklan_core.procedures import PROCEDURES
+
+RECIPE_EXTENSIONS = (".json", ".toml")
+
+# Recipe path -> ((mtime_ns, size), prepared steps)
+_cache = {}
+
+
+def recipe_library_dir():
+    return os.path.join(Gimp.directory(), "recipes")
+
+
+def resolve_recipe_path(recipe, library_dir):
+    # A bare name refers to <library_dir>/<name>.json (or .toml), anything
+    # else is used as a path
+    if os.sep in recipe or recipe.endswith(RECIPE_EXTENSIONS):
+        return os.path.expanduser(recipe)
+
+    for extension in RECIPE_EXTENSIONS:
+        path = os.path.join(library_dir, recipe + extension)
+        if os.path.exists(path):
+            return path
+    return os.path.join(library_dir, recipe + RECIPE_EXTENSIONS[0])
+
+
+def parse_recipe(path):
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            recipe = tomllib.load(f)
+    else:
+        with open(path) as f:
+            recipe = json.load(f)
+
+    steps = recipe.get("steps")
+    if not isinstance(steps, list) or not steps:
+        raise ValueError(f"{path}: a recipe needs a non-empty 'steps' list")
+
+    for number, step in enumerate(steps, start=1):
+        if not isinstance(step, dict):
+            raise ValueError(f"{path}: step {number} must be an object (a table in TOML)")
+        name = step.get("procedure")
+        if not isinstance(name, str) or name not in PROCEDURES:
+            raise ValueError(f"{path}: step {number} names unknown procedure '{name}'")
+        if not isinstance(step.get("arguments", {}), dict):
+            raise ValueError(f"{path}: step {number}, 'arguments' must be an object")
+        layer_names = step.get("layers")
+        if layer_names is not None and (not isinstance(layer_names, list)
+                                        or not all(isinstance(layer, str) for layer in layer_names)):
+            raise ValueError(f"{path}: step {number}, 'layers' must be a list of layer names")
+
+        declared = {argument["name"] for argument in PROCEDURES[name].get("arguments", [])}
+        for argument_name in step.get("arguments", {}):
+            if argument_name not in declared:
+                raise ValueError(f"{path}: step {number}, {name} has no argument '{argument_name}'")
+
+    return steps
+
+
+def prepare_steps(steps):
+    # (operation, config, layer names) for each step
+    prepared = []
+    for step in steps:
+        name = step["procedure"]
+        operation = resolve_operation(name)
+        if operation is None:
+            raise ValueError(f"{name} cannot be used in a recipe")
+
+        config = pdb.lookup(name).create_config()
+        for argument_name, value in step.get("arguments", {}).items():
+            try:
+                config.set_property(argument_name, value)
+            except TypeError as e:
+                raise ValueError(f"{name} argument '{argument_name}' cannot be {value!r}: {e}")
+
+        prepared.append((operation, config, step.get("layers")))
+    return prepared
+
+
+def load_recipe(path):
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    prepared = prepare_steps(parse_recipe(path))
+    _cache[path] = (signature, prepared)
+    return prepared
+
+
+def select_layers(image, layer_names):
+    layers = []
+    for layer_name in layer_names:
+        layer = image.get_layer_by_name(layer_name)
+        if layer is None:
+            raise ProcedureError(f"Recipe step needs a layer named '{layer_name}'")
+        layers.append(layer)
+    image.set_selected_layers(layers)
+
+
+def run_recipe(image, drawables, config):
+    path = resolve_recipe_path(config.get_property("recipe"), recipe_library_dir())
+    try:
+        steps = load_recipe(path)
+    except (OSError, ValueError, pdb.PDBError) as e:
+        raise ProcedureError(f"Failed to load recipe: {e}")
+
+    for operation, step_config, layer_names in steps:
+        if layer_names:
+            select_layers(image, layer_names)
+
+        if not Gimp.context_push():
+            raise ProcedureError("Recipe step failed to push context!")
+        try:
+            operation(image, image.get_selected_layers(), step_config)
+        finally:
+            Gimp.context_pop()
+
+    return f"Applied recipe {os.path.basename(path)} ({len(steps)} steps)."
+
+
+owenjklan_run_recipe = procedure_runner(run_recipe)
@@ -0,0 +1,105 @@
+###
+# Guide templates: guide layouts saved as JSON, in percent or pixel form.
+#
+#   {
+#     "units": "percent",
+#     "width": 1920,
+#     "height": 1080,
+#     "horizontal": [33.3333, 66.6667],
+#     "vertical": [50.0]
+#   }
+#
+# "width" and "height" record the image the template was exported from.
+# Loaded templates are cached in-process and re-read only when the file's
+# modification time or size changes.
+#
+# No gi imports, so templates can be produced and checked outside GIMP.
+
+import json
+import math
+import os
+
+UNITS = ("percent", "pixels")
+
+# Template path -> ((mtime_ns, size), template)
+_cache = {}
+
+
+def resolve_template_path(template, library_dir):
+    # A bare name refers to <library_dir>/<name>.json, anything with a
+    # directory separator or .json suffix is used as a path.
+    if os.sep in template or template.endswith(".json"):
+        return os.path.expanduser(template)
+    return os.path.join(library_dir, template + ".json")
+
+
+def make_template(width, height, horizontal, vertical, units="percent"):
+    # Template from pixel guide positions of a width x height image
+    if units not in UNITS:
+        raise ValueError(f"Unknown guide template units '{units}'")
+
+    if units == "percent":
+        horizontal = [round(position * 100.0 / height, 4) for position in horizontal]
+        vertical = [round(position * 100.0 / width, 4) for position in vertical]
+
+    return {
+        "units": units,
+        "width": width,
+        "height": height,
+        "horizontal": sorted(horizontal),
+        "vertical": sorted(vertical),
+    }
+
+
+def template_positions(template, width, height):
+    # (horizontal, vertical) pixel positions of 'template' for a width x
+    # height image. Pixel templates are used as-is, except for positions
+    # beyond the image which are dropped.
+    if template["units"] == "percent":
+        horizontal = [round(height * position / 100.0) for position in template["horizontal"]]
+        vertical = [round(width * position / 100.0) for position in template["vertical"]]
+    else:
+        horizontal = [int(position) for position in template["horizontal"]]
+        vertical = [int(position) for position in template["vertical"]]
+
+    return ([position for position in horizontal if 0 <= position <= height],
+            [position for position in vertical if 0 <= position <= width])
+
+
+def save_template(path, template):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(template, f, indent=2)
+
+    _cache.pop(path, None)
+
+
+def is_position(value):
+    # A finite number (JSON allows NaN and Infinity, bool is an int)
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def load_template(path):
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with open(path) as f:
+        template = json.load(f)
+
+    if not isinstance(template, dict):
+        raise ValueError(f"{path}: a guide template must be a JSON object")
+    if template.get("units") not in UNITS:
+        raise ValueError(f"{path}: 'units' must be one of {', '.join(UNITS)}")
+    for key in ("horizontal", "vertical"):
+        positions = template.get(key)
+        if not isinstance(positions, list) or not all(is_position(p) for p in positions):
+            raise ValueError(f"{path}: '{key}' must be a list of numeric positions")
+
+    _cache[path] = (signature, template)
+    return template
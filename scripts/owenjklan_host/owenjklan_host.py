@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+###
+# This was created with guidance from the following links:
+# - https://testing.docs.gimp.org/3.0/en/gimp-using-python-plug-in-tutorial.html
+# - https://developer.gimp.org/api/3.0/libgimp/method.PlugIn.persistent_enable.html
+#
+# GIMP 3.0 extension that keeps a single Python process resident and
+# serves every procedure from the other plug-ins in this repository.
+#
+# Normally each invocation of e.g. owenjklan-auto-outline starts a new
+# Python interpreter, imports gi and runs Gimp.main() before doing any work.
+# This extension is started once by GIMP at startup and registers every
+# procedure from owenjklan_core.procedures as a temporary procedure named
+# "owenjklan-resident-*" (eg. owenjklan-resident-auto-outline). Calls to those
+# are answered by this already-running process.
+#
+# Bind shortcuts / Stream Deck buttons to the "(Resident)" menu entries to
+# skip the interpreter startup.
+
+import os
+import sys
+
+# owenjklan_core is installed next to this plug-in's directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from owenjklan_core.plugin import Gimp, create_procedure
+from owenjklan_core.procedures import procedure_names
+from gi.repository import GLib
+
+HOST_PROCEDURE = "owenjklan-extension-host"
+
+
+def resident_name(name):
+    # owenjklan-auto-outline -> owenjklan-resident-auto-outline
+    return name.replace("owenjklan-", "owenjklan-resident-", 1)
+
+
+class ExtensionHost (Gimp.PlugIn):
+    def do_query_procedures(self):
+        return [ HOST_PROCEDURE ]
+
+    def do_set_i18n (self, name):
+        return False
+
+    def do_create_procedure(self, name):
+        # A persistent procedure without arguments is run automatically by
+        # GIMP at startup.
+        procedure = Gimp.Procedure.new(self, name,
+                                       Gimp.PDBProcType.PERSISTENT,
+                                       self.run, None)
+
+        procedure.set_documentation("Resident host for owenjklan plug-ins",
+                                    "Keeps one Python process alive and registers the owenjklan-* procedures"
+                                    " as temporary 'owenjklan-resident-*' procedures, avoiding interpreter"
+                                    " startup on every call.",
+                                    name)
+        procedure.set_attribution("Owen Klan", "Owen Klan", "2024")
+
+        return procedure
+
+    def register_hosted_procedures(self):
+        # The implementing modules are imported on first call and then stay
+        # loaded in this process.
+        for name in procedure_names():
+            procedure = create_procedure(self, name, Gimp.PDBProcType.TEMPORARY,
+                                         resident_name(name))
+            procedure.set_menu_label(procedure.get_menu_label() + " (Resident)")
+            self.add_temp_procedure(procedure)
+
+    def run(self, procedure, config, run_data):
+        self.register_hosted_procedures()
+
+        # Tell GIMP we are ready, then serve temporary procedure calls for
+        # the lifetime of the GIMP session.
+        self.persistent_enable()
+        while True:
+            self.persistent_process(0)
+
+        return procedure.new_return_values(Gimp.PDBStatusType.SUCCESS, GLib.Error())
+
+
+if __name__ == "__main__":
+    Gimp.main(ExtensionHost.__gtype__, sys.argv)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+###
+# This was created with guidance from the following links:
+# - https://testing.docs.gimp.org/3.0/en/gimp-using-python-plug-in-tutorial.html
+#
+# GIMP 3.0 Plugin that will run a recipe: a chain of the other owenjklan
+# procedures (eg. canvas resize, quick black, auto-outline, thirds guides)
+# in one invocation, with one undo step and no intermediate messages.
+#
+# The procedures themselves are declared in owenjklan_core.procedures and
+# implemented in owenjklan_core.recipes.
+
+import os
+import sys
+
+# owenjklan_core is installed next to this plug-in's directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from owenjklan_core.plugin import Gimp, OwenjklanPlugIn
+
+
+class Recipes (OwenjklanPlugIn):
+    plugin_name = "recipes"
+
+
+if __name__ == "__main__":
+    Gimp.main(Recipes.__gtype__, sys.argv)